@@ -2,8 +2,12 @@ from fastapi import APIRouter
 from .dataset import router as load_dataset_router
 from .default_datasets import router as getDefault_router
 from .optimization import router as optimize_router
+from .metrics import router as metrics_router
+from .prediction import router as prediction_router
 
 api_router = APIRouter()
 api_router.include_router(load_dataset_router, prefix="/load")
 api_router.include_router(getDefault_router, prefix="/getDefault")
-api_router.include_router(optimize_router, prefix="/optimize")
\ No newline at end of file
+api_router.include_router(optimize_router, prefix="/optimize")
+api_router.include_router(metrics_router)
+api_router.include_router(prediction_router)
\ No newline at end of file
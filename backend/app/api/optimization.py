@@ -1,29 +1,187 @@
-from pathlib import Path
+import asyncio
+import json
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from app.models.optimization_request import OptimizationRequest
-from app.services.optimizer import run_optimization
+from app.models.resume_request import ResumeRequest
+from app.services.artifacts import artifact_writer
+from app.services.checkpoints import is_valid_checkpoint_id, load_checkpoint_meta
+from app.services.jobs import job_manager
+from app.services.model_registry import MODEL_ORDERINGS, model_registry
+from app.services.prediction import model_cache
 
 router = APIRouter()
 
-MODEL_STORAGE_DIR = Path("app/storage/models")
+SSE_KEEPALIVE_SECONDS = 15
+
+def _get_job_or_404(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+async def _job_event_stream(job):
+    queue = job.subscribe()
+    try:
+        while True:
+            try:
+                event, payload = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+            if event == "end":
+                break
+    finally:
+        job.unsubscribe(queue)
+
+
+def _event_stream_response(job):
+    return StreamingResponse(
+        _job_event_stream(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @router.post("/start-optimization")
 async def start_optimization(req: OptimizationRequest):
-    return await run_optimization(req)
+    job = job_manager.submit(req)
+    await asyncio.wrap_future(job.future)
+    if job.status == "completed":
+        return job.result
+    return {"error": job.error or f"Optimization {job.status}."}
 
 
-@router.get("/download-model/{model_id}")
-async def download_model(model_id: str):
-    if not MODEL_STORAGE_DIR.exists():
-        raise HTTPException(status_code=404, detail="Model not found.")
+@router.post("/jobs", status_code=202)
+async def submit_optimization_job(req: OptimizationRequest):
+    job = job_manager.submit(req)
+    return job.to_dict(include_progress=False)
+
+
+@router.get("/jobs")
+async def list_optimization_jobs():
+    return {"jobs": [job.to_dict(include_progress=False) for job in job_manager.list()]}
+
+
+@router.get("/jobs/{job_id}")
+async def get_optimization_job(job_id: str):
+    return _get_job_or_404(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_optimization_job(job_id: str):
+    return _event_stream_response(_get_job_or_404(job_id))
+
+
+@router.post("/stream-optimization")
+async def stream_optimization(req: OptimizationRequest):
+    return _event_stream_response(job_manager.submit(req))
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_optimization_job_result(job_id: str):
+    job = _get_job_or_404(job_id)
+    if job.status == "completed":
+        return job.result
+    if job.finished:
+        raise HTTPException(status_code=409, detail=job.error or f"Job {job.status}.")
+    raise HTTPException(status_code=409, detail=f"Job is still {job.status}.")
 
-    matching_files = list(MODEL_STORAGE_DIR.glob(f"{model_id}_*.joblib"))
-    if not matching_files:
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_optimization_job(job_id: str):
+    _get_job_or_404(job_id)
+    return job_manager.cancel(job_id).to_dict(include_progress=False)
+
+
+@router.post("/jobs/{job_id}/resume", status_code=202)
+async def resume_optimization_job(job_id: str, req: ResumeRequest = ResumeRequest()):
+    running = job_manager.get(job_id)
+    if running is not None and not running.finished:
+        raise HTTPException(status_code=409, detail=f"Job is still {running.status}.")
+
+    meta = load_checkpoint_meta(job_id) if is_valid_checkpoint_id(job_id) else None
+    if meta is None:
+        raise HTTPException(status_code=404, detail="No checkpoint found for this job.")
+    if req.additional_generations < 0:
+        raise HTTPException(status_code=400, detail="additional_generations cannot be negative.")
+    if req.additional_generations == 0 and meta["generation"] >= meta["request"]["generations"]:
+        raise HTTPException(
+            status_code=409,
+            detail="The run already completed every generation; pass additional_generations to continue it.",
+        )
+
+    job = job_manager.resume(job_id, req.additional_generations)
+    return job.to_dict(include_progress=False)
+
+
+async def _get_model_or_404(model_id: str):
+    pending = artifact_writer.pending(model_id)
+    if pending is not None:
+        # The run has returned but its artifact is still being written.
+        try:
+            await asyncio.wrap_future(pending)
+        except Exception:
+            raise HTTPException(status_code=500, detail="The model artifact could not be written.")
+    record = model_registry.get(model_id)
+    if record is None:
         raise HTTPException(status_code=404, detail="Model not found.")
+    return record
+
+
+@router.get("/models")
+async def list_models(
+    dataset_id: Optional[str] = None,
+    model_type: Optional[str] = None,
+    task_type: Optional[str] = None,
+    min_score: Optional[float] = None,
+    order_by: str = "newest",
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    if order_by not in MODEL_ORDERINGS:
+        raise HTTPException(status_code=400, detail=f"order_by must be one of: {', '.join(MODEL_ORDERINGS)}.")
+    result = model_registry.query(
+        dataset_id=dataset_id,
+        model_type=model_type,
+        task_type=task_type,
+        min_score=min_score,
+        order_by=order_by,
+        limit=limit,
+        offset=offset,
+    )
+    return {**result, "limit": limit, "offset": offset}
 
-    file_path = matching_files[0]
+
+@router.get("/models/stats")
+async def model_registry_stats():
+    return model_registry.stats()
+
+
+@router.get("/models/{model_id}")
+async def get_model(model_id: str):
+    return await _get_model_or_404(model_id)
+
+
+@router.delete("/models/{model_id}")
+async def delete_model(model_id: str):
+    await _get_model_or_404(model_id)
+    model_registry.delete(model_id)
+    model_cache.discard(model_id)
+    return {"deleted": model_id}
+
+
+@router.get("/download-model/{model_id}")
+async def download_model(model_id: str):
+    record = await _get_model_or_404(model_id)
+    file_path = model_registry.path(record)
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail="Model file is missing.")
+    # Sent in chunks, with Range requests answered as 206 partial content.
     return FileResponse(
         path=file_path,
         filename=file_path.name,
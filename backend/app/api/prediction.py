@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Request
+from app.services.prediction import PredictionInputError, model_cache, predict_batch
+from .optimization import _get_model_or_404
+
+router = APIRouter()
+
+@router.post("/predict/{model_id}")
+async def predict(model_id: str, request: Request, probabilities: bool = False):
+    record = await _get_model_or_404(model_id)
+    if record["feature_names"] is None:
+        raise HTTPException(
+            status_code=409,
+            detail="This model was exported without its feature columns and cannot be served.",
+        )
+    try:
+        return await predict_batch(
+            record,
+            await request.body(),
+            request.headers.get("content-type", "application/json"),
+            probabilities=probabilities,
+        )
+    except PredictionInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except FileNotFoundError:
+        model_cache.discard(model_id)
+        raise HTTPException(status_code=404, detail="Model file is missing.")
+
+
+@router.get("/predict/cache/stats")
+async def prediction_cache_stats():
+    return model_cache.stats()
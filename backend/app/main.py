@@ -1,3 +1,4 @@
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import optimization, dataset, default_datasets
@@ -7,6 +8,12 @@ from app.api import api_router
 import os
 from sklearn.datasets import load_iris, load_wine
 
+# Application loggers (app.*) log at LOG_LEVEL; records below it are dropped
+# before any message formatting happens. Other libraries keep the root
+# logger's default level.
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logging.getLogger("app").setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
@@ -50,9 +57,9 @@ async def create_default_datasets():
     for name, path in DEFAULT_DATASETS.items():
         if not os.path.exists(path):
             save_dataset(name, path)
-            print(f"[INFO] Created dataset '{name}' from scikit-learn.")
+            logger.info("Created dataset '%s' from scikit-learn.", name)
         else:
-            print(f"[INFO] Dataset '{name}' already exists.")
+            logger.info("Dataset '%s' already exists.", name)
 
 
 
@@ -1,7 +1,39 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 class OptimizationRequest(BaseModel):
     target_column: str
+    dataset_id: Optional[str] = None  # falls back to the most recently loaded dataset
     generations: int = 10
     population_size: int = 10
+    seed: int = 42  # seeds the GA, the models and the CV folds; equal seeds give identical runs
     model_type: str = "random_forest"  # could be: "random_forest", "svm", "neural_network"
+    evaluation_backend: str = "serial"  # could be: "serial", "thread", "process", "joblib", "isolated"
+    n_workers: Optional[int] = None  # defaults to every available core for parallel backends
+    evaluation_timeout_seconds: Optional[float] = None  # kill an evaluation after this long; needs the "isolated" backend
+    evaluation_memory_limit_mb: Optional[float] = None  # address space an evaluation may add; needs the "isolated" backend
+    use_fitness_cache: bool = True
+    persist_fitness_cache: bool = False  # also keep scores on disk under app/storage across restarts
+    multi_fidelity: bool = False  # successive halving: screen on a budget, train only the best at full fidelity
+    fidelity_min_budget: float = 0.25  # fraction of rows and trees/epochs at the lowest rung
+    fidelity_eta: int = 3  # keep the top 1/eta of each rung
+    patience: Optional[int] = None  # stop after this many generations without improvement
+    min_delta: float = 0.0  # smallest best-score gain that counts as an improvement
+    min_diversity: Optional[float] = None  # stop once the share of distinct chromosomes drops to this
+    time_budget_seconds: Optional[float] = None  # wall-clock budget, checked between generations
+    max_evaluations: Optional[int] = None  # cap on fitness evaluations across the run
+    elitism: int = 1  # best individuals carried into the next generation unchanged
+    cv_folds: Optional[int] = None  # k-fold CV fitness on the training split instead of a single holdout score
+    cv_early_abandon: bool = True  # stop scoring an individual once it cannot reach the last generation's median
+    seed_from: Optional[str] = None  # job id of an earlier run on the same dataset to warm-start from
+    surrogate: bool = False  # pre-screen an oversized offspring pool with a model fitted on past scores
+    surrogate_pool_factor: int = 4  # offspring bred per slot in the next population
+    surrogate_exploration: float = 1.0  # weight of the surrogate's uncertainty when ranking offspring
+    islands: int = 1  # independent sub-populations of population_size each, in separate processes
+    migration_interval: int = 2  # generations between migrations around the island ring
+    migration_size: int = 1  # best individuals each island sends per migration
+    island_transport: str = "queue"  # could be: "queue", "tcp"
+    steady_state: bool = False  # asynchronous GA without generation barriers; stats per population_size evaluations
+    artifact_compression: Optional[str] = None  # could be: "none", "zlib", "lz4", "zstd", "mmap"; defaults to MODEL_ARTIFACT_COMPRESSION
+    artifact_compression_level: Optional[int] = None  # zlib 1-9, lz4 1-16, zstd 1-22; 3 when unset
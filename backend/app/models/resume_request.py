@@ -0,0 +1,4 @@
+from pydantic import BaseModel
+
+class ResumeRequest(BaseModel):
+    additional_generations: int = 0
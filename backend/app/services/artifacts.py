@@ -0,0 +1,144 @@
+import importlib.util
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import joblib
+
+from .instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+# "mmap" stores the model uncompressed so its numpy arrays can be memory-mapped
+# on load instead of read into memory.
+ARTIFACT_COMPRESSIONS = ("none", "zlib", "lz4", "zstd", "mmap")
+MODEL_ARTIFACT_COMPRESSION = os.environ.get("MODEL_ARTIFACT_COMPRESSION", "zlib")
+ARTIFACT_WRITER_THREADS = int(os.environ.get("ARTIFACT_WRITER_THREADS", "1"))
+
+COMPRESSION_LEVELS = {"zlib": (1, 9, 3), "lz4": (1, 16, 3), "zstd": (1, 22, 3)}  # min, max, default
+# Compressions that need a package which is not a hard dependency.
+_OPTIONAL_MODULES = {"lz4": "lz4", "zstd": "zstandard"}
+
+
+def compression_error(compression: str, level: Optional[int]) -> Optional[str]:
+    if compression not in ARTIFACT_COMPRESSIONS:
+        return f"Unsupported artifact compression '{compression}'. Choose one of: {', '.join(ARTIFACT_COMPRESSIONS)}."
+    module = _OPTIONAL_MODULES.get(compression)
+    if module is not None and importlib.util.find_spec(module) is None:
+        return f"Artifact compression '{compression}' needs the '{module}' package, which is not installed."
+    if level is not None:
+        if compression not in COMPRESSION_LEVELS:
+            return f"Artifact compression '{compression}' does not take a level."
+        low, high, _ = COMPRESSION_LEVELS[compression]
+        if not low <= level <= high:
+            return f"{compression} compression level must be between {low} and {high}."
+    return None
+
+
+def artifact_file_name(model_id: str, model_type: str, compression: str) -> str:
+    # joblib recognizes its own compressors when loading; zstd streams are
+    # written around joblib, so they get their own suffix.
+    suffix = ".joblib.zst" if compression == "zstd" else ".joblib"
+    return f"{model_id}_{model_type}{suffix}"
+
+
+def dump_artifact(model: Any, path: Path, compression: str, level: Optional[int] = None) -> None:
+    if level is None and compression in COMPRESSION_LEVELS:
+        level = COMPRESSION_LEVELS[compression][2]
+    # Written next to the target and renamed, so a reader never sees a
+    # half-written file.
+    temporary = path.with_name(f".{path.name}.tmp")
+    try:
+        if compression == "zstd":
+            import zstandard
+
+            with open(temporary, "wb") as handle:
+                with zstandard.ZstdCompressor(level=level).stream_writer(handle, closefd=False) as stream:
+                    joblib.dump(model, stream)
+        else:
+            compress = (compression, level) if compression in ("zlib", "lz4") else 0
+            joblib.dump(model, temporary, compress=compress)
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def load_artifact(path: Path, compression: Optional[str] = None) -> Any:
+    if compression == "zstd":
+        import zstandard
+
+        with open(path, "rb") as handle:
+            # joblib peeks at the header to detect compression, which the raw
+            # zstd reader cannot seek back over.
+            with io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(handle)) as stream:
+                return joblib.load(stream)
+    return joblib.load(path, mmap_mode="r" if compression == "mmap" else None)
+
+
+class ArtifactWriter:
+    """Writes model artifacts on a background thread.
+
+    A run hands the fitted model over and returns; dumping and compressing
+    it no longer add to the response time. `on_written` runs once the file
+    is in place, and `pending` lets readers wait for a model that is still
+    being written.
+    """
+
+    def __init__(self, max_workers: int = ARTIFACT_WRITER_THREADS):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="artifact-writer")
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        model_id: str,
+        model: Any,
+        path: Path,
+        compression: str,
+        level: Optional[int] = None,
+        on_written: Optional[Callable[[], Any]] = None,
+    ) -> Future:
+        with self._lock:
+            future = self._executor.submit(self._write, model_id, model, path, compression, level, on_written)
+            self._pending[model_id] = future
+        return future
+
+    def pending(self, model_id: str) -> Optional[Future]:
+        with self._lock:
+            return self._pending.get(model_id)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            futures = list(self._pending.values())
+        for future in futures:
+            try:
+                future.result(timeout)
+            except Exception:
+                pass
+
+    def _write(self, model_id, model, path, compression, level, on_written) -> Any:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            started = time.perf_counter()
+            dump_artifact(model, path, compression, level)
+            metrics.observe_run({"model_dump": {"seconds": time.perf_counter() - started, "count": 1}})
+            return on_written() if on_written is not None else None
+        except Exception:
+            logger.exception("Writing model artifact %s failed", model_id)
+            metrics.increment(
+                "model_artifact_failures_total",
+                help_text="Model artifacts that could not be written.",
+            )
+            path.unlink(missing_ok=True)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(model_id, None)
+
+
+artifact_writer = ArtifactWriter()
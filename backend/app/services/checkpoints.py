@@ -0,0 +1,166 @@
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+
+CHECKPOINT_DIR = Path("app/storage/checkpoints")
+
+_CHECKPOINT_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def is_valid_checkpoint_id(checkpoint_id: str) -> bool:
+    return bool(_CHECKPOINT_ID_PATTERN.match(checkpoint_id))
+
+
+def checkpoint_dir(checkpoint_id: str) -> Path:
+    return CHECKPOINT_DIR / checkpoint_id
+
+
+def _replace_atomically(path: Path, write) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class CheckpointWriter:
+    """Persists run_ga state after every generation.
+
+    Arrays and the best model go to files named after the generation, and
+    meta.json is replaced last to point at them, so a crash mid-write leaves
+    the previous checkpoint intact.
+    """
+
+    def __init__(self, checkpoint_id: str, request: Dict[str, Any], dataset_fingerprint: str, dataset_id: str):
+        self.directory = checkpoint_dir(checkpoint_id)
+        self.request = request
+        self.dataset_fingerprint = dataset_fingerprint
+        self.dataset_id = dataset_id
+        self.model_file: Optional[str] = None
+
+    def seed_from(self, checkpoint: Dict[str, Any]) -> None:
+        # A resumed run starts out pointing at the best model it inherited.
+        source = checkpoint["directory"] / checkpoint["best_model_file"] if checkpoint.get("best_model_file") else None
+        if source is not None and source.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, self.directory / source.name)
+            self.model_file = source.name
+
+    def __call__(self, state: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generation = state["generation"]
+        stale_files = []
+
+        if state["best_improved"] and state["best_model"] is not None:
+            model_file = f"best_model-{generation}.joblib"
+            _replace_atomically(self.directory / model_file, lambda path: joblib.dump(state["best_model"], path))
+            if self.model_file is not None:
+                stale_files.append(self.model_file)
+            self.model_file = model_file
+        elif state["best_improved"]:
+            # The new best has no fitted model (cache hit or CV score), so an
+            # older file would no longer match best_params.
+            if self.model_file is not None:
+                stale_files.append(self.model_file)
+            self.model_file = None
+
+        arrays_file = f"state-{generation}.npz"
+
+        arrays = {
+            "genes": state["genes"],
+            "evaluated_genes": state["evaluated_genes"],
+            "fitnesses": np.asarray(state["fitnesses"], dtype=float),
+            "fidelities": np.asarray(state["fidelities"], dtype=float),
+        }
+        # Surrogate-assisted runs also keep the scored history the surrogate
+        # is fitted on.
+        if state.get("history_scores") is not None:
+            arrays["history_genes"] = state["history_genes"]
+            arrays["history_scores"] = state["history_scores"]
+
+        def write_arrays(path: Path) -> None:
+            with open(path, "wb") as handle:
+                np.savez(handle, **arrays)
+
+        _replace_atomically(self.directory / arrays_file, write_arrays)
+
+        previous = load_checkpoint_meta(self.directory.name)
+        if previous is not None and previous.get("arrays_file") != arrays_file:
+            stale_files.append(previous["arrays_file"])
+
+        meta = {
+            "checkpoint_id": self.directory.name,
+            "request": self.request,
+            "dataset_id": self.dataset_id,
+            "dataset_fingerprint": self.dataset_fingerprint,
+            "generation": generation,
+            "arrays_file": arrays_file,
+            "best_model_file": self.model_file,
+            "rng_state": state["rng_state"],
+            "best_params": state["best_params"],
+            "best_fitness": state["best_fitness"],
+            "generation_scores": state["generation_scores"],
+            "generation_details": state["generation_details"],
+            "evaluations": state["evaluations"],
+            "stale_generations": state["stale_generations"],
+            "plateau_score": state["plateau_score"],
+            "abandon_threshold": state["abandon_threshold"],
+            "stop_reason": state["stop_reason"],
+        }
+        _replace_atomically(
+            self.directory / "meta.json",
+            lambda path: path.write_text(json.dumps(meta, default=float), encoding="utf-8"),
+        )
+
+        for name in stale_files:
+            (self.directory / name).unlink(missing_ok=True)
+
+
+def load_checkpoint_meta(checkpoint_id: str) -> Optional[Dict[str, Any]]:
+    meta_path = checkpoint_dir(checkpoint_id) / "meta.json"
+    if not meta_path.exists():
+        return None
+    return json.loads(meta_path.read_text(encoding="utf-8"))
+
+
+def load_checkpoint(checkpoint_id: str) -> Optional[Dict[str, Any]]:
+    if not is_valid_checkpoint_id(checkpoint_id):
+        return None
+    meta = load_checkpoint_meta(checkpoint_id)
+    if meta is None:
+        return None
+    directory = checkpoint_dir(checkpoint_id)
+    with np.load(directory / meta["arrays_file"], allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    return {**meta, **arrays, "directory": directory}
+
+
+def load_best_model(checkpoint: Dict[str, Any]):
+    if not checkpoint.get("best_model_file"):
+        return None
+    return joblib.load(checkpoint["directory"] / checkpoint["best_model_file"])
+
+
+def top_candidates(checkpoint: Dict[str, Any], count: int) -> List[np.ndarray]:
+    # Distinct, fully scored chromosomes from the last evaluated generation,
+    # best first.
+    genes = checkpoint["evaluated_genes"]
+    fitnesses = checkpoint["fitnesses"]
+    order = np.lexsort((-fitnesses, -checkpoint["fidelities"]))
+    candidates = []
+    seen = set()
+    for idx in order:
+        if not np.isfinite(fitnesses[idx]) or checkpoint["fidelities"][idx] < 1.0:
+            continue
+        key = genes[idx].tobytes()
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append(genes[idx])
+        if len(candidates) == count:
+            break
+    return candidates
@@ -1,10 +1,30 @@
+import os
+import warnings
 import pandas as pd
 import numpy as np
-from io import StringIO
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
 from app.models.dataset_request import DatasetRequest
+from .dataset_registry import DATASET_STORAGE_DIR, dataset_path, dataset_registry, is_valid_dataset_id
+from .streaming_ingest import (
+    CategoricalAccumulator,
+    CorrelationAccumulator,
+    NumericAccumulator,
+    iter_csv_chunks,
+    kurtosis_from_moments,
+    pearson_from_sums,
+    resolve_csv_dtypes,
+    skew_from_moments,
+    spool_upload,
+)
 
+# Legacy single-dataset location, adopted into the store on first use.
 DATA_PATH = "app/storage/dataset.csv"
+LATEST_DATASET_POINTER = DATASET_STORAGE_DIR / "LATEST"
+# Uploads above this size are summarized chunk by chunk instead of in memory.
+IN_MEMORY_SUMMARY_MAX_BYTES = int(os.environ.get("IN_MEMORY_SUMMARY_MAX_BYTES", str(64 * 1024 * 1024)))
+CORRELATION_BLOCK_SIZE = 512
 DEFAULT_DATASETS = {
     "iris": "app/templates/iris.csv",
     "wine": "app/templates/wine.csv",
@@ -20,19 +40,45 @@ def _round_numeric(value: Any, precision: int = 4) -> Any:
 
 
 def _summarize_numeric_columns(df: pd.DataFrame, numeric_cols: List[str]) -> Dict[str, Dict[str, Any]]:
+    if not numeric_cols:
+        return {}
+
+    # All moments come from one column-major float64 block, using the same
+    # estimators as the pandas Series reductions they replace.
+    values = np.asfortranarray(df[numeric_cols].to_numpy(dtype=np.float64))
+    missing = np.isnan(values)
+    count = (~missing).sum(axis=0).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(missing, 0.0, values).sum(axis=0) / count
+        centered = np.where(missing, 0.0, values - mean)
+        squared = centered ** 2
+        m2 = squared.sum(axis=0)
+        m3 = (squared * centered).sum(axis=0)
+        m4 = (squared ** 2).sum(axis=0)
+        std = np.sqrt(m2 / (count - 1))
+    with warnings.catch_warnings():
+        # All-missing columns are skipped below.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(values, axis=0)
+        minimum = np.nanmin(values, axis=0)
+        maximum = np.nanmax(values, axis=0)
+    skew = skew_from_moments(count, m2, m3)
+    kurt = kurtosis_from_moments(count, m2, m4)
+
     summary: Dict[str, Dict[str, Any]] = {}
-    for col in numeric_cols:
-        series = df[col].dropna()
-        if series.empty:
+    for idx, col in enumerate(numeric_cols):
+        if count[idx] == 0:
             continue
+        # Integer columns report integer extremes, as Series.min/max would.
+        cast = int if df[col].dtype.kind in "iu" else float
         summary[col] = {
-            "mean": _round_numeric(series.mean()),
-            "std": _round_numeric(series.std()),
-            "min": _round_numeric(series.min()),
-            "max": _round_numeric(series.max()),
-            "median": _round_numeric(series.median()),
-            "skewness": _round_numeric(series.skew()),
-            "kurtosis": _round_numeric(series.kurt()),
+            "mean": _round_numeric(mean[idx]),
+            "std": _round_numeric(std[idx]),
+            "min": _round_numeric(cast(minimum[idx])),
+            "max": _round_numeric(cast(maximum[idx])),
+            "median": _round_numeric(median[idx]),
+            "skewness": _round_numeric(skew[idx]),
+            "kurtosis": _round_numeric(kurt[idx]),
         }
     return summary
 
@@ -56,37 +102,90 @@ def _summarize_categorical_columns(df: pd.DataFrame, categorical_cols: List[str]
     return summary
 
 
+def _upper_pairs(block: np.ndarray, col_offset: int, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Pairs (i, j) with i < j and |r| >= threshold from a block holding the
+    # correlations of every column against columns col_offset onwards.
+    block = np.abs(block, out=block)
+    with np.errstate(invalid="ignore"):
+        keep = block >= threshold
+    keep &= np.arange(block.shape[0])[:, None] < (col_offset + np.arange(block.shape[1]))[None, :]
+    rows, cols = np.nonzero(keep)
+    return rows, cols + col_offset, block[rows, cols]
+
+
+def _correlation_blocks(values: np.ndarray, block_size: int = CORRELATION_BLOCK_SIZE):
+    # Yields (offset, block) slices of the correlation matrix so wide tables
+    # never materialize the full columns x columns matrix.
+    width = values.shape[1]
+    present = ~np.isnan(values)
+    if present.all():
+        centered = values - values.mean(axis=0)
+        norms = np.sqrt((centered ** 2).sum(axis=0))
+        for start in range(0, width, block_size):
+            stop = min(start + block_size, width)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                block = (centered.T @ centered[:, start:stop]) / np.outer(norms, norms[start:stop])
+            yield start, np.clip(block, -1.0, 1.0)
+        return
+
+    # Pairwise-complete correlations, matching DataFrame.corr with gaps.
+    weights = present.astype(np.float64)
+    shift = np.where(present, values, 0.0).sum(axis=0) / np.maximum(weights.sum(axis=0), 1)
+    shifted = np.where(present, values - shift, 0.0)
+    squared = shifted ** 2
+    for start in range(0, width, block_size):
+        cols = slice(start, min(start + block_size, width))
+        yield start, pearson_from_sums(
+            weights.T @ weights[:, cols],
+            shifted.T @ weights[:, cols],
+            weights.T @ shifted[:, cols],
+            squared.T @ weights[:, cols],
+            weights.T @ squared[:, cols],
+            shifted.T @ shifted[:, cols],
+        )
+
+
+def _rank_correlations(
+    rows: np.ndarray, cols: np.ndarray, pair_values: np.ndarray, columns: List[str], limit: int = 10
+) -> List[Dict[str, Any]]:
+    if pair_values.size == 0:
+        return []
+    if pair_values.size > limit:
+        # Rounding can tie values around the cut-off, so keep everything that
+        # could round to the limit-th largest value and rank those exactly.
+        kth = pair_values[np.argpartition(-pair_values, limit - 1)[limit - 1]]
+        keep = pair_values >= kth - 1e-4
+        rows, cols, pair_values = rows[keep], cols[keep], pair_values[keep]
+
+    rounded = np.array([_round_numeric(value) for value in pair_values])
+    # Same order as the original column-major scan followed by a stable sort.
+    order = np.lexsort((rows, cols, -rounded))[:limit]
+    return [
+        {
+            "feature_a": columns[rows[idx]],
+            "feature_b": columns[cols[idx]],
+            "correlation": float(rounded[idx]),
+        }
+        for idx in order
+    ]
+
+
 def _top_correlations(df: pd.DataFrame, threshold: float = 0.5, limit: int = 10) -> List[Dict[str, Any]]:
     numeric_df = df.select_dtypes(include=[np.number])
     if numeric_df.empty:
         return []
-    corr_matrix = numeric_df.corr().abs()
-    upper_tri = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-    correlations: List[Dict[str, Any]] = []
-    for col in upper_tri.columns:
-        for row in upper_tri.index:
-            value = upper_tri.loc[row, col]
-            if pd.notnull(value) and value >= threshold:
-                correlations.append(
-                    {
-                        "feature_a": row,
-                        "feature_b": col,
-                        "correlation": _round_numeric(value),
-                    }
-                )
-    correlations.sort(key=lambda item: item["correlation"], reverse=True)
-    return correlations[:limit]
+    values = numeric_df.to_numpy(dtype=np.float64)
+    pairs = [_upper_pairs(block, start, threshold) for start, block in _correlation_blocks(values)]
+    rows, cols, pair_values = (np.concatenate(parts) for parts in zip(*pairs))
+    return _rank_correlations(rows, cols, pair_values, numeric_df.columns.tolist(), limit)
 
 
 def _summarize_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
     categorical_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
 
-    missing_values = {
-        col: int(df[col].isna().sum())
-        for col in df.columns
-        if int(df[col].isna().sum()) > 0
-    }
+    missing_counts = df.isna().sum()
+    missing_values = {col: int(count) for col, count in missing_counts.items() if count > 0}
 
     return {
         "shape": {"rows": int(df.shape[0]), "columns": int(df.shape[1])},
@@ -99,20 +198,130 @@ def _summarize_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
-def _build_dataset_response(message: str, df: pd.DataFrame) -> Dict[str, Any]:
-    summary = _summarize_dataframe(df)
+def _summarize_csv_stream(path: Path) -> Tuple[List[str], Dict[str, Any]]:
+    # Bounded-memory counterpart of _summarize_dataframe for files too large
+    # to load at once. Medians are estimated once a column outgrows the
+    # reservoir; every other statistic, including the order of tied
+    # top_values, matches the in-memory summary.
+    dtypes = resolve_csv_dtypes(path)
+    columns = list(dtypes)
+    numeric_cols = [col for col, dtype in dtypes.items() if dtype in ("int64", "float64")]
+    categorical_cols = [col for col in columns if col not in numeric_cols]
+
+    numeric = NumericAccumulator(numeric_cols)
+    correlations = CorrelationAccumulator(numeric_cols)
+    categorical = CategoricalAccumulator(categorical_cols)
+    missing = pd.Series(0, index=columns, dtype="int64")
+    row_count = 0
+    sample_rows: List[Dict[str, Any]] = []
+
+    for chunk in iter_csv_chunks(path, dtypes):
+        if not sample_rows:
+            sample_rows = chunk.head(5).to_dict(orient="records")
+        row_count += len(chunk)
+        missing += chunk.isna().sum()
+        if numeric_cols:
+            values = chunk[numeric_cols].to_numpy(dtype=np.float64)
+            numeric.update(values)
+            correlations.update(values)
+        categorical.update(chunk)
+
+    std, skew, kurt = numeric.std(), numeric.skew(), numeric.kurtosis()
+    numeric_summary: Dict[str, Dict[str, Any]] = {}
+    for idx, col in enumerate(numeric_cols):
+        if numeric.count[idx] == 0:
+            continue
+        cast = int if dtypes[col] == "int64" else float
+        numeric_summary[col] = {
+            "mean": _round_numeric(numeric.mean[idx]),
+            "std": _round_numeric(std[idx]),
+            "min": _round_numeric(cast(numeric.minimum[idx])),
+            "max": _round_numeric(cast(numeric.maximum[idx])),
+            "median": _round_numeric(numeric.median(idx)),
+            "skewness": _round_numeric(skew[idx]),
+            "kurtosis": _round_numeric(kurt[idx]),
+        }
+
+    categorical_summary: Dict[str, Dict[str, Any]] = {}
+    for col in categorical_cols:
+        counts = categorical.value_counts(col)
+        categorical_summary[col] = {
+            "unique_values": int(counts.size),
+            "top_values": [
+                {
+                    "value": idx,
+                    "count": int(count),
+                    "percentage": _round_numeric((count / row_count) * 100, 2),
+                }
+                for idx, count in counts.head(5).items()
+            ],
+        }
+
+    summary = {
+        "shape": {"rows": int(row_count), "columns": len(columns)},
+        "column_types": dict(dtypes),
+        "missing_values": {col: int(count) for col, count in missing.items() if count > 0},
+        "numeric_summary": numeric_summary,
+        "categorical_summary": categorical_summary,
+        "top_correlations": _rank_correlations(*_upper_pairs(correlations.matrix(), 0, 0.5), numeric_cols) if numeric_cols else [],
+        "sample_rows": sample_rows,
+    }
+    return columns, summary
+
+
+def _dataset_payload(message: str, columns: List[str], summary: Dict[str, Any], dataset_id: str, created: bool) -> Dict[str, Any]:
     return {
         "message": message,
-        "columns": df.columns.tolist(),
+        "dataset_id": dataset_id,
+        "deduplicated": not created,
+        "columns": columns,
         "summary": summary,
     }
 
 
+def _build_dataset_response(message: str, df: pd.DataFrame, dataset_id: str, created: bool) -> Dict[str, Any]:
+    summary = _summarize_dataframe(df)
+    return _dataset_payload(message, df.columns.tolist(), summary, dataset_id, created)
+
+
+def _store_dataframe(df: pd.DataFrame) -> Tuple[str, bool]:
+    dataset_id, created = dataset_registry.store(df.to_csv(index=False).encode("utf-8"), df)
+    LATEST_DATASET_POINTER.write_text(dataset_id)
+    return dataset_id, created
+
+
+def resolve_dataset_path(dataset_id: Optional[str] = None) -> Optional[Path]:
+    if dataset_id is None:
+        if LATEST_DATASET_POINTER.exists():
+            dataset_id = LATEST_DATASET_POINTER.read_text().strip()
+        elif os.path.exists(DATA_PATH):
+            # Adopt a dataset written by an older version into the store once.
+            dataset_id, _ = dataset_registry.store(Path(DATA_PATH).read_bytes())
+            LATEST_DATASET_POINTER.write_text(dataset_id)
+        else:
+            return None
+
+    if not is_valid_dataset_id(dataset_id):
+        return None
+    path = dataset_path(dataset_id)
+    return path if path.exists() else None
+
+
+def _summarize_stored_upload(path: Path, size: int, dataset_id: str, created: bool) -> Dict[str, Any]:
+    message = "Dataset uploaded successfully"
+    if size <= IN_MEMORY_SUMMARY_MAX_BYTES:
+        df = pd.read_csv(path)
+        dataset_registry.remember(dataset_id, df)
+        return _build_dataset_response(message, df, dataset_id, created)
+    columns, summary = _summarize_csv_stream(path)
+    return _dataset_payload(message, columns, summary, dataset_id, created)
+
+
 async def handle_upload(file):
-    contents = await file.read()
-    df = pd.read_csv(StringIO(contents.decode("utf-8")))
-    df.to_csv(DATA_PATH, index=False)
-    return _build_dataset_response("Dataset uploaded successfully", df)
+    tmp_path, dataset_id, size = await spool_upload(file, DATASET_STORAGE_DIR)
+    path, created = dataset_registry.adopt(tmp_path, dataset_id)
+    LATEST_DATASET_POINTER.write_text(dataset_id)
+    return await run_in_threadpool(_summarize_stored_upload, path, size, dataset_id, created)
 
 
 def load_default_datasets():
@@ -125,5 +334,5 @@ def load_default_dataset_service(payload: DatasetRequest):
 
     path = DEFAULT_DATASETS[payload.name]
     df = pd.read_csv(path)
-    df.to_csv(DATA_PATH, index=False)
-    return _build_dataset_response(f"{payload.name} dataset loaded successfully", df)
+    dataset_id, created = _store_dataframe(df)
+    return _build_dataset_response(f"{payload.name} dataset loaded successfully", df, dataset_id, created)
@@ -0,0 +1,293 @@
+import hashlib
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+from sklearn.model_selection import train_test_split
+from sklearn.utils.multiclass import type_of_target
+
+from .instrumentation import RunTimings, timed
+from .preprocessing import encode_features, encoded_feature_names, fit_feature_encoder
+
+DATASET_CACHE_MAX_BYTES = int(os.environ.get("DATASET_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+DATASET_STORAGE_DIR = Path("app/storage/datasets")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_DATASET_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _file_signature(path: Path) -> Tuple[str, int, int]:
+    stat = path.stat()
+    return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_valid_dataset_id(dataset_id: str) -> bool:
+    return bool(_DATASET_ID_PATTERN.match(dataset_id))
+
+
+def dataset_path(dataset_id: str) -> Path:
+    return DATASET_STORAGE_DIR / f"{dataset_id}.csv"
+
+
+class PreparedDataset:
+    def __init__(
+        self,
+        content_hash: str,
+        target_column: str,
+        X: Any,
+        y: np.ndarray,
+        feature_names: List[str],
+        target_classes: Optional[List[str]] = None,
+        encoder: Any = None,
+    ):
+        self.content_hash = content_hash
+        self.target_column = target_column
+        # Dense float32, or CSR when the one-hot encoding is wide.
+        self.X = X
+        self.y = y
+        self.feature_names = feature_names
+        self.target_classes = target_classes
+        self.encoder = encoder
+        self.target_type = type_of_target(y)
+        self._splits: Dict[Tuple[float, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def fingerprint(self) -> str:
+        target_digest = hashlib.sha256(self.target_column.encode("utf-8")).hexdigest()[:16]
+        return f"{self.content_hash}:{target_digest}"
+
+    @property
+    def is_classification(self) -> bool:
+        return self.target_type in ["binary", "multiclass"]
+
+    @property
+    def row_count(self) -> int:
+        return int(self.X.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        if sp.issparse(self.X):
+            x_bytes = self.X.data.nbytes + self.X.indices.nbytes + self.X.indptr.nbytes
+        else:
+            x_bytes = self.X.nbytes
+        return int(x_bytes + self.y.nbytes)
+
+    def split(self, test_size: float, random_state: int):
+        key = (test_size, random_state)
+        with self._lock:
+            if key not in self._splits:
+                # Splitting row indices yields the same partition as splitting
+                # X and y directly, and is cheap to keep around per seed.
+                self._splits[key] = train_test_split(
+                    np.arange(self.row_count),
+                    test_size=test_size,
+                    random_state=random_state,
+                    stratify=self.y if self.is_classification else None,
+                )
+            train_idx, val_idx = self._splits[key]
+        return self.X[train_idx], self.X[val_idx], self.y[train_idx], self.y[val_idx]
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The encoder goes first: a cache entry only counts once its arrays
+        # exist, and then the encoder is already there.
+        encoder_file = encoder_path(path)
+        # Unique temporary names: concurrent runs may prepare the same dataset.
+        encoder_tmp_path = encoder_file.with_name(f"{encoder_file.name}.{uuid.uuid4().hex}.tmp")
+        joblib.dump(self.encoder, encoder_tmp_path)
+        os.replace(encoder_tmp_path, encoder_file)
+
+        if sp.issparse(self.X):
+            arrays = {
+                "X_data": self.X.data,
+                "X_indices": self.X.indices,
+                "X_indptr": self.X.indptr,
+                "X_shape": np.array(self.X.shape),
+            }
+        else:
+            arrays = {"X": self.X}
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "wb") as handle:
+            np.savez(
+                handle,
+                **arrays,
+                y=self.y,
+                feature_names=np.array(self.feature_names, dtype=str),
+                target_classes=np.array(self.target_classes or [], dtype=str),
+                has_target_classes=np.array(self.target_classes is not None),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, content_hash: str, target_column: str) -> "PreparedDataset":
+        encoder = joblib.load(encoder_path(path))
+        with np.load(path, allow_pickle=False) as data:
+            target_classes = data["target_classes"].tolist() if bool(data["has_target_classes"]) else None
+            if "X" in data:
+                X = data["X"]
+            else:
+                X = sp.csr_matrix((data["X_data"], data["X_indices"], data["X_indptr"]), shape=tuple(data["X_shape"]))
+            return cls(
+                content_hash,
+                target_column,
+                X,
+                data["y"],
+                data["feature_names"].tolist(),
+                target_classes,
+                encoder,
+            )
+
+
+def encoder_path(cache_path: Path) -> Path:
+    return cache_path.with_name(f"{cache_path.stem}.encoder.joblib")
+
+
+def prepare_dataset(df: pd.DataFrame, content_hash: str, target_column: str) -> PreparedDataset:
+    features = df.drop(columns=[target_column])
+    encoder = fit_feature_encoder(features)
+    y = df[target_column]
+
+    target_classes = None
+    if y.dtype == "object":
+        codes, uniques = pd.factorize(y)
+        y_values = codes.astype(np.int64)
+        target_classes = [str(label) for label in uniques]
+    else:
+        y_values = y.to_numpy()
+
+    return PreparedDataset(
+        content_hash,
+        target_column,
+        encode_features(encoder, features),
+        y_values,
+        encoded_feature_names(encoder),
+        target_classes,
+        encoder,
+    )
+
+
+class DatasetRegistry:
+    def __init__(self, max_bytes: int = DATASET_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Tuple[Any, int]]" = OrderedDict()
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def content_hash(self, path) -> str:
+        path = Path(path)
+        signature = _file_signature(path)
+        with self._lock:
+            cached = self._hashes.get(signature)
+        if cached is not None:
+            return cached
+        content_hash = hash_file(path)
+        with self._lock:
+            self._hashes[signature] = content_hash
+        return content_hash
+
+    def store(self, content: bytes, df: Optional[pd.DataFrame] = None) -> Tuple[str, bool]:
+        dataset_id = hashlib.sha256(content).hexdigest()
+        DATASET_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = DATASET_STORAGE_DIR / f"{dataset_id}.{uuid.uuid4().hex}.tmp"
+        tmp_path.write_bytes(content)
+        _, created = self.adopt(tmp_path, dataset_id)
+        if df is not None:
+            self.remember(dataset_id, df)
+        return dataset_id, created
+
+    def adopt(self, tmp_path: Path, dataset_id: str) -> Tuple[Path, bool]:
+        # Datasets are stored under the SHA-256 of their bytes, so identical
+        # uploads share one file and concurrent uploads never collide.
+        path = dataset_path(dataset_id)
+        created = not path.exists()
+        if created:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, path)
+        else:
+            tmp_path.unlink(missing_ok=True)
+        with self._lock:
+            self._hashes[_file_signature(path)] = dataset_id
+        return path, created
+
+    def remember(self, dataset_id: str, df: pd.DataFrame) -> None:
+        self._put((dataset_id, None), df, int(df.memory_usage(deep=True).sum()))
+
+    def get_frame(self, path) -> Tuple[str, pd.DataFrame]:
+        content_hash = self.content_hash(path)
+        df = self._get((content_hash, None))
+        if df is None:
+            df = pd.read_csv(path)
+            self._put((content_hash, None), df, int(df.memory_usage(deep=True).sum()))
+        return content_hash, df
+
+    def prepare(self, path, target_column: str, timings: Optional[RunTimings] = None) -> Optional[PreparedDataset]:
+        path = Path(path)
+        content_hash = self.content_hash(path)
+        key = (content_hash, target_column)
+
+        dataset = self._get(key)
+        if dataset is not None:
+            return dataset
+
+        cache_path = self._cache_path(path, target_column)
+        # Caches written before the encoder was persisted are rebuilt.
+        if cache_path.exists() and encoder_path(cache_path).exists():
+            with timed(timings, "data_loading"):
+                dataset = PreparedDataset.load(cache_path, content_hash, target_column)
+        else:
+            with timed(timings, "data_loading"):
+                _, df = self.get_frame(path)
+            if target_column not in df.columns:
+                return None
+            with timed(timings, "preprocessing"):
+                dataset = prepare_dataset(df, content_hash, target_column)
+                dataset.save(cache_path)
+
+        self._put(key, dataset, dataset.nbytes)
+        return dataset
+
+    def _cache_path(self, path: Path, target_column: str) -> Path:
+        # Stored datasets are immutable, so the arrays never go stale.
+        target_digest = hashlib.sha256(target_column.encode("utf-8")).hexdigest()[:16]
+        return path.parent / f"{path.stem}.{target_digest}.npz"
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _put(self, key, value, size: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+
+dataset_registry = DatasetRegistry()
@@ -0,0 +1,256 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+EVALUATION_BACKENDS = ("serial", "thread", "process", "joblib", "isolated")
+
+# Shared payload installed once per worker process by the pool initializer, so
+# only the individual chromosome travels with each task.
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(fn: Callable, shared: Tuple[Any, ...]) -> None:
+    _WORKER_STATE["fn"] = fn
+    _WORKER_STATE["shared"] = shared
+
+
+def _evaluate_in_worker(item: Any, options: Dict[str, Any]) -> Any:
+    return _WORKER_STATE["fn"](item, *_WORKER_STATE["shared"], **options)
+
+
+def _address_space_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _run_isolated(
+    connection, fn: Callable, item: Any, shared_path: str, options: Dict[str, Any], memory_limit_mb
+) -> None:
+    # Memory-mapped, so the training data is paged in rather than copied.
+    shared = joblib.load(shared_path, mmap_mode="r")
+    if memory_limit_mb is not None:
+        # The child already maps the interpreter, numpy and the dataset, so
+        # the limit is what the evaluation may add on top.
+        limit = (_address_space_bytes() or 0) + int(memory_limit_mb * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        connection.send(("ok", fn(item, *shared, **options)))
+    except Exception as exc:
+        connection.send(("error", exc))
+    finally:
+        connection.close()
+
+
+def resolve_worker_count(n_workers: Optional[int]) -> int:
+    if n_workers is None or n_workers <= 0:
+        return os.cpu_count() or 1
+    return n_workers
+
+
+class SerialEvaluator:
+    name = "serial"
+
+    def __init__(self, fn: Callable, shared: Tuple[Any, ...], n_workers: Optional[int] = 1):
+        self.fn = fn
+        self.shared = shared
+        self.n_workers = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    def submit(self, item: Any, **options) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(self.fn(item, *self.shared, **options))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def map(self, items: Sequence[Any], **options) -> List[Any]:
+        return [self.fn(item, *self.shared, **options) for item in items]
+
+
+class ThreadPoolEvaluator(SerialEvaluator):
+    name = "thread"
+
+    def __init__(self, fn: Callable, shared: Tuple[Any, ...], n_workers: Optional[int] = None):
+        super().__init__(fn, shared)
+        self.n_workers = resolve_worker_count(n_workers)
+        self._executor = self._create_executor()
+
+    def _create_executor(self):
+        return ThreadPoolExecutor(max_workers=self.n_workers)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def submit(self, item: Any, **options) -> Future:
+        return self._executor.submit(self.fn, item, *self.shared, **options)
+
+    def map(self, items: Sequence[Any], **options) -> List[Any]:
+        # Futures are collected in submission order, so results line up with
+        # the serial backend regardless of which worker finishes first.
+        futures = [self.submit(item, **options) for item in items]
+        return [future.result() for future in futures]
+
+
+class ProcessPoolEvaluator(ThreadPoolEvaluator):
+    name = "process"
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(self.fn, self.shared),
+        )
+
+    def submit(self, item: Any, **options) -> Future:
+        return self._executor.submit(_evaluate_in_worker, item, options)
+
+
+class JoblibEvaluator(ProcessPoolEvaluator):
+    name = "joblib"
+
+    def _create_executor(self):
+        from joblib.externals.loky import ProcessPoolExecutor as LokyProcessPoolExecutor
+
+        return LokyProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(self.fn, self.shared),
+        )
+
+
+class IsolatedEvaluator(ThreadPoolEvaluator):
+    """Runs every evaluation in a fresh child process.
+
+    Children come from a forkserver (spawn where that is unavailable) rather
+    than a plain fork: the API process runs job threads, the artifact
+    writer and the server loop, and a forked child could inherit a lock
+    another thread held and deadlock. The shared training data is written
+    once to a temporary file and memory-mapped by each child. A child is
+    killed once it exceeds `timeout_seconds`, which includes its startup,
+    without taking a pool down with it, and a memory limit caps its
+    address space, so an oversized fit fails with MemoryError inside the
+    child instead of swapping the host. Killed evaluations resolve to
+    `limit_result` and are counted in `timeouts` and `crashes`.
+    """
+
+    name = "isolated"
+
+    def __init__(
+        self,
+        fn: Callable,
+        shared: Tuple[Any, ...],
+        n_workers: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        memory_limit_mb: Optional[float] = None,
+        limit_result: Any = None,
+    ):
+        if memory_limit_mb is not None and resource is None:
+            raise ValueError("Memory limits are not supported on this platform.")
+        super().__init__(fn, shared, n_workers)
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self.limit_result = limit_result
+        self.timeouts = 0
+        self.crashes = 0
+        self._lock = threading.Lock()
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context("forkserver")
+            # Only takes effect when the server starts; children then fork
+            # with scikit-learn already imported.
+            self._context.set_forkserver_preload([fn.__module__])
+        else:
+            self._context = multiprocessing.get_context("spawn")
+        handle, self._shared_path = tempfile.mkstemp(prefix="hpo-isolated-", suffix=".joblib")
+        os.close(handle)
+        joblib.dump(shared, self._shared_path)
+
+    def close(self) -> None:
+        super().close()
+        if os.path.exists(self._shared_path):
+            os.unlink(self._shared_path)
+
+    def _evaluate(self, item: Any, options: Dict[str, Any]) -> Any:
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_run_isolated,
+            args=(sender, self.fn, item, self._shared_path, options, self.memory_limit_mb),
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+        try:
+            if receiver.poll(self.timeout_seconds):
+                status, payload = receiver.recv()
+            else:
+                status, payload = "timeout", None
+        except EOFError:
+            # The child died without answering, e.g. killed by the OOM killer.
+            status, payload = "crashed", None
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+
+        if status == "ok":
+            return payload
+        if status == "error":
+            raise payload
+        with self._lock:
+            if status == "timeout":
+                self.timeouts += 1
+            else:
+                self.crashes += 1
+        return self.limit_result
+
+    def submit(self, item: Any, **options) -> Future:
+        return self._executor.submit(self._evaluate, item, options)
+
+
+_EVALUATOR_CLASSES = {
+    "serial": SerialEvaluator,
+    "thread": ThreadPoolEvaluator,
+    "process": ProcessPoolEvaluator,
+    "joblib": JoblibEvaluator,
+    "isolated": IsolatedEvaluator,
+}
+
+
+def create_evaluator(
+    backend: str,
+    fn: Callable,
+    shared: Tuple[Any, ...],
+    n_workers: Optional[int] = None,
+    **limits,
+):
+    if backend not in _EVALUATOR_CLASSES:
+        raise ValueError(
+            f"Unsupported evaluation backend '{backend}'. Choose one of: {', '.join(EVALUATION_BACKENDS)}."
+        )
+    if backend == "isolated":
+        return IsolatedEvaluator(fn, shared, n_workers, **limits)
+    if limits.get("timeout_seconds") is not None or limits.get("memory_limit_mb") is not None:
+        raise ValueError("Evaluation time and memory limits require the 'isolated' backend.")
+    return _EVALUATOR_CLASSES[backend](fn, shared, n_workers)
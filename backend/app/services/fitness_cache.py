@@ -0,0 +1,168 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+FITNESS_CACHE_PATH = Path("app/storage/fitness_cache.sqlite3")
+FITNESS_CACHE_MAX_ENTRIES = int(os.environ.get("FITNESS_CACHE_MAX_ENTRIES", "50000"))
+
+
+def _canonical_value(value: Any) -> Any:
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        # repr round-trips exactly, so only bit-identical floats share a key.
+        return repr(float(value))
+    return value
+
+
+def canonicalize_chromosome(chromosome: Dict[str, Any]) -> str:
+    return json.dumps(
+        {key: _canonical_value(value) for key, value in chromosome.items()},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+class FitnessCache:
+    def __init__(self, max_entries: int = FITNESS_CACHE_MAX_ENTRIES, disk_path: Path = FITNESS_CACHE_PATH):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._memory: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def session(
+        self,
+        dataset_id: str,
+        split_seed: int,
+        model_type: str,
+        use_disk: bool = False,
+        scheme: str = "holdout",
+        run_seed: Optional[int] = None,
+    ):
+        return FitnessCacheSession(self, dataset_id, split_seed, model_type, use_disk, scheme, run_seed)
+
+    def get(self, key: str, use_disk: bool = False):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key], "memory"
+            if use_disk:
+                row = self._disk().execute(
+                    "SELECT fitness FROM fitness_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    return row[0], "disk"
+        return None, None
+
+    def put(self, key: str, fitness: float, use_disk: bool = False) -> None:
+        with self._lock:
+            self._remember(key, fitness)
+            # Failures are kept in memory only; they may be environment
+            # specific and should not outlive the process.
+            if use_disk and math.isfinite(fitness):
+                connection = self._disk()
+                connection.execute(
+                    "INSERT OR REPLACE INTO fitness_cache (cache_key, fitness) VALUES (?, ?)",
+                    (key, fitness),
+                )
+                connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, key: str, fitness: float) -> None:
+        self._memory[key] = fitness
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.disk_path), check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fitness_cache (cache_key TEXT PRIMARY KEY, fitness REAL NOT NULL)"
+            )
+            self._connection.commit()
+        return self._connection
+
+
+class FitnessCacheSession:
+    def __init__(
+        self,
+        cache: FitnessCache,
+        dataset_id: str,
+        split_seed: int,
+        model_type: str,
+        use_disk: bool,
+        scheme: str,
+        run_seed: Optional[int],
+    ):
+        self.cache = cache
+        self.use_disk = use_disk
+        self._prefix = f"{dataset_id}:{split_seed}:{model_type}:"
+        # The run seed fixes the models' random_state and the CV folds, so
+        # scores are only shared between runs with the same seed. Runs always
+        # pass one, so disk entries written before seeded runs are never hit
+        # again; their scores came from differently seeded models anyway.
+        if run_seed is not None:
+            self._prefix += f"seed{run_seed}:"
+        # The holdout scheme adds no segment of its own.
+        if scheme != "holdout":
+            self._prefix += f"{scheme}:"
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, chromosome: Dict[str, Any], budget: float = 1.0) -> str:
+        canonical = canonicalize_chromosome(chromosome)
+        if budget < 1.0:
+            canonical += f"@{budget!r}"
+        return hashlib.sha256((self._prefix + canonical).encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[float]:
+        fitness, tier = self.cache.get(key, use_disk=self.use_disk)
+        if tier == "memory":
+            self.memory_hits += 1
+        elif tier == "disk":
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+        return fitness
+
+    def record_duplicate(self) -> None:
+        # A chromosome repeated within one generation is trained once and
+        # served to its duplicates, which counts as a memory hit.
+        self.memory_hits += 1
+
+    def store(self, key: str, fitness: float) -> None:
+        self.cache.put(key, fitness, use_disk=self.use_disk)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": True,
+            "persistent": self.use_disk,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+fitness_cache = FitnessCache()
@@ -1,14 +1,35 @@
+import logging
 import numpy as np
-import random
-from copy import deepcopy
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.svm import SVC
 from sklearn.neural_network import MLPClassifier, MLPRegressor
 from sklearn.metrics import accuracy_score, mean_squared_error
+from sklearn.model_selection import KFold, StratifiedKFold
 from sklearn.utils.multiclass import type_of_target
 
-random.seed(42)
-np.random.seed(42)
+from .evaluation import create_evaluator
+from .instrumentation import RunTimings
+from .population import GeneSchema, fitness_ranks, next_generation, population_diversity
+from .surrogate import FitnessSurrogate
+
+
+logger = logging.getLogger(__name__)
+
+
+class OptimizationCancelled(Exception):
+    pass
+
+
+MIN_BUDGET_ROWS = 20
+# Fitness of an evaluation killed for exceeding its time or memory limit; it
+# ranks with failed fits, below every real score.
+LIMIT_PENALTY = (float('-inf'), None, None, None)
+# Model types whose search fits differ from the final fit, so the winner is
+# always retrained with train_model.
+FINAL_REFIT_MODELS = ("svm",)
 
 # --- Hyperparameter Ranges ---
 HYPERPARAM_RANGES = {
@@ -32,62 +53,89 @@ HYPERPARAM_RANGES = {
     }
 }
 
-def generate_chromosome(model_type):
-    chromosome = {}
-    for key, val_range in HYPERPARAM_RANGES[model_type].items():
-        if isinstance(val_range[0], float):
-            chromosome[key] = random.uniform(*val_range)
-        else:
-            chromosome[key] = random.randint(*val_range)
-    return chromosome
+def budget_rungs(min_budget, eta):
+    rungs = []
+    budget = min_budget
+    while budget < 1.0:
+        rungs.append(budget)
+        budget *= eta
+    rungs.append(1.0)
+    return rungs
+
+def build_model(chromosome, model_type, target_type, budget=1.0, random_state=None, final=False):
+    # A budget below 1.0 shrinks the iterative part of the model (trees or
+    # epochs) in proportion, for low-fidelity screening. `final` marks the
+    # fit of the winner; search fits skip anything predict does not need.
+    if model_type == "random_forest":
+        model_cls = RandomForestClassifier if target_type in ["binary", "multiclass"] else RandomForestRegressor
+        return model_cls(
+            n_estimators=max(1, int(round(int(chromosome["n_estimators"]) * budget))),
+            max_depth=int(chromosome["max_depth"]),
+            min_samples_split=int(chromosome["min_samples_split"]),
+            min_samples_leaf=int(chromosome["min_samples_leaf"]),
+            max_features=chromosome["max_features"],
+            random_state=random_state
+        )
 
-def create_population(size, model_type):
-    return [generate_chromosome(model_type) for _ in range(size)]
+    if model_type == "svm":
+        if target_type not in ["binary", "multiclass"]:
+            return None
+        return SVC(
+            C=chromosome["C"],
+            gamma=chromosome["gamma"],
+            tol=chromosome["tol"],
+            # Platt scaling runs an extra internal 5-fold CV and only feeds
+            # predict_proba, which fitness never calls.
+            probability=final,
+            random_state=random_state
+        )
 
-def evaluate_fitness(chromosome, X_train, X_val, y_train, y_val, model_type):
-    target_type = type_of_target(y_train)
+    if model_type == "neural_network":
+        layer_count = int(chromosome["hidden_layer_sizes"])
+        layer_size = int(chromosome["layer_size"])
+        hidden_layers = tuple([layer_size] * layer_count)
+
+        model_cls = MLPClassifier if target_type in ["binary", "multiclass"] else MLPRegressor
+        return model_cls(
+            hidden_layer_sizes=hidden_layers,
+            alpha=chromosome["alpha"],
+            learning_rate_init=chromosome["learning_rate_init"],
+            max_iter=max(1, int(500 * budget)),
+            random_state=random_state
+        )
 
-    try:
-        if model_type == "random_forest":
-            model_cls = RandomForestClassifier if target_type in ["binary", "multiclass"] else RandomForestRegressor
-            model = model_cls(
-                n_estimators=int(chromosome["n_estimators"]),
-                max_depth=int(chromosome["max_depth"]),
-                min_samples_split=int(chromosome["min_samples_split"]),
-                min_samples_leaf=int(chromosome["min_samples_leaf"]),
-                max_features=chromosome["max_features"],
-                random_state=42
-            )
+    return None
 
-        elif model_type == "svm":
-            if target_type not in ["binary", "multiclass"]:
-                return float('-inf'), None, None
-            model = SVC(
-                C=chromosome["C"],
-                gamma=chromosome["gamma"],
-                tol=chromosome["tol"],
-                probability=True
-            )
+def train_model(chromosome, X_train, y_train, model_type, random_state=None):
+    model = build_model(chromosome, model_type, type_of_target(y_train), random_state=random_state, final=True)
+    if model is None:
+        return None
+    model.fit(X_train, y_train)
+    return model
 
-        elif model_type == "neural_network":
-            layer_count = int(chromosome["hidden_layer_sizes"])
-            layer_size = int(chromosome["layer_size"])
-            hidden_layers = tuple([layer_size] * layer_count)
-
-            model_cls = MLPClassifier if target_type in ["binary", "multiclass"] else MLPRegressor
-            model = model_cls(
-                hidden_layer_sizes=hidden_layers,
-                alpha=chromosome["alpha"],
-                learning_rate_init=chromosome["learning_rate_init"],
-                max_iter=500,
-                random_state=42
-            )
+def evaluate_fitness(chromosome, X_train, X_val, y_train, y_val, model_type, random_state=None, budget=1.0):
+    # Results are (score, chromosome, model, timings); timings holds the fit
+    # and predict seconds measured wherever the evaluation ran.
+    target_type = type_of_target(y_train)
+    timings = {}
 
-        else:
-            return float('-inf'), None, None
+    try:
+        model = build_model(chromosome, model_type, target_type, budget=budget, random_state=random_state)
+        if model is None:
+            return float('-inf'), None, None, timings
+
+        if budget < 1.0:
+            # The training split is already shuffled, so its head is a random
+            # subsample.
+            rows = max(MIN_BUDGET_ROWS, int(X_train.shape[0] * budget))
+            X_train, y_train = X_train[:rows], y_train[:rows]
 
+        started = time.perf_counter()
         model.fit(X_train, y_train)
+        timings["fit"] = time.perf_counter() - started
+        started = time.perf_counter()
         predictions = model.predict(X_val)
+        timings["predict"] = time.perf_counter() - started
 
         score = (
             accuracy_score(y_val, predictions)
@@ -95,46 +143,195 @@ def evaluate_fitness(chromosome, X_train, X_val, y_train, y_val, model_type):
             else -mean_squared_error(y_val, predictions)
         )
 
-        return score, chromosome, model
+        return score, chromosome, model, timings
 
     except Exception as e:
-        print(f"Fitness eval failed: {e}")
-        return float('-inf'), None, None
-
-def selection(population, fitnesses, tournament_size=3):
-    selected = []
-    for _ in range(len(population)):
-        participants = random.sample(list(zip(population, fitnesses)), tournament_size)
-        participants.sort(key=lambda x: x[1], reverse=True)
-        selected.append(participants[0][0])
-    return selected
-
-def crossover(parent1, parent2):
-    keys = list(parent1.keys())
-    point = random.randint(1, len(keys) - 1)
-
-    child1 = {}
-    child2 = {}
-
-    for i, key in enumerate(keys):
-        if i < point:
-            child1[key] = parent1[key]
-            child2[key] = parent2[key]
+        logger.warning("Fitness eval failed: %s", e)
+        return float('-inf'), None, None, timings
+
+def _evaluation_limits(timeout_seconds, memory_limit_mb, limit_result):
+    # The isolated backend needs limit_result even without limits: a child
+    # that crashes still has to resolve to a penalty.
+    return {"timeout_seconds": timeout_seconds, "memory_limit_mb": memory_limit_mb, "limit_result": limit_result}
+
+def make_folds(y, n_folds, seed=None):
+    splitter_cls = StratifiedKFold if type_of_target(y) in ["binary", "multiclass"] else KFold
+    splitter = splitter_cls(n_splits=n_folds, shuffle=True, random_state=seed)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+def evaluate_fold(task, X, y, folds, model_type, random_state=None):
+    chromosome, fold = task
+    train_idx, val_idx = folds[fold]
+    score, _, _, timings = evaluate_fitness(
+        chromosome, X[train_idx], X[val_idx], y[train_idx], y[val_idx], model_type, random_state
+    )
+    return score, timings
+
+def _record_evaluations(results, timings):
+    if timings is not None:
+        for result in results:
+            timings.add_all(result[3])
+    return results
+
+def _evaluate_population(chromosomes, evaluator, fitness_cache=None, budget=1.0, timings=None):
+    if fitness_cache is None:
+        return _record_evaluations(evaluator.map(chromosomes, budget=budget), timings)
+
+    results = [None] * len(chromosomes)
+    pending = {}
+    for idx, chromosome in enumerate(chromosomes):
+        key = fitness_cache.key(chromosome, budget)
+        if key in pending:
+            fitness_cache.record_duplicate()
+            pending[key].append(idx)
+            continue
+        fitness = fitness_cache.lookup(key)
+        if fitness is None:
+            pending[key] = [idx]
         else:
-            child1[key] = parent2[key]
-            child2[key] = parent1[key]
-
-    return child1, child2
-
-def mutate(chromosome, model_type, mutation_rate=0.1):
-    for key in chromosome:
-        if random.random() < mutation_rate:
-            r = HYPERPARAM_RANGES[model_type][key]
-            if isinstance(r[0], float):
-                chromosome[key] = random.uniform(*r)
-            else:
-                chromosome[key] = random.randint(*r)
-    return chromosome
+            # Cached individuals carry no trained model; run_ga refits the
+            # winner at the end if it came from the cache.
+            results[idx] = (fitness, chromosome if np.isfinite(fitness) else None, None, None)
+
+    keys = list(pending)
+    evaluated = _record_evaluations(
+        evaluator.map([chromosomes[pending[key][0]] for key in keys], budget=budget), timings
+    )
+    for key, result in zip(keys, evaluated):
+        fitness_cache.store(key, result[0])
+        for idx in pending[key]:
+            results[idx] = result
+    return results
+
+def _successive_halving(chromosomes, evaluator, fitness_cache, rungs, eta, timings=None, carried=None):
+    # Every individual is scored at the lowest budget; the best 1/eta move up
+    # a rung each time until the survivors are trained at full fidelity.
+    # Elites in `carried` keep their full-fidelity result and skip the rungs,
+    # so a noisy low-budget score cannot drop them.
+    carried = carried or {}
+    results = [None] * len(chromosomes)
+    fidelities = [0.0] * len(chromosomes)
+    for idx, result in carried.items():
+        results[idx] = result
+        fidelities[idx] = 1.0
+    evaluations_per_rung = []
+    active = [idx for idx in range(len(chromosomes)) if idx not in carried]
+    for budget in rungs:
+        if not active:
+            break
+        rung_results = _evaluate_population(
+            [chromosomes[idx] for idx in active], evaluator, fitness_cache, budget=budget, timings=timings
+        )
+        evaluations_per_rung.append(len(active))
+        for idx, (fitness, params, model, evaluation_timings) in zip(active, rung_results):
+            # Low-fidelity models are never exported, so drop them early.
+            results[idx] = (fitness, params, model if budget >= 1.0 else None, evaluation_timings)
+            fidelities[idx] = budget
+        if budget >= 1.0:
+            break
+        keep = max(1, int(np.ceil(len(active) / eta)))
+        active = sorted(active, key=lambda idx: results[idx][0], reverse=True)[:keep]
+    return results, fidelities, evaluations_per_rung
+
+def _carry_elites(genes, evaluated_genes, results, fidelities, fitnesses, elitism):
+    # next_generation puts the elites first, in rank order. Only those still
+    # in place after migration, and scored at full fidelity, are carried.
+    carried = {}
+    order = np.argsort(fitness_ranks(fidelities, fitnesses))[::-1][:elitism]
+    for slot, idx in enumerate(order):
+        if fidelities[idx] >= 1.0 and np.array_equal(genes[slot], evaluated_genes[idx]):
+            fitness, params, model, _ = results[idx]
+            carried[slot] = (fitness, params, model, None)
+    return carried
+
+def _cross_validate_population(
+    chromosomes, evaluator, n_folds, fitness_cache=None, threshold=None, score_bound=None, timings=None
+):
+    results = [None] * len(chromosomes)
+    fidelities = [1.0] * len(chromosomes)
+    pending = {}
+    for idx, chromosome in enumerate(chromosomes):
+        key = fitness_cache.key(chromosome) if fitness_cache is not None else idx
+        if key in pending:
+            fitness_cache.record_duplicate()
+            pending[key].append(idx)
+            continue
+        fitness = fitness_cache.lookup(key) if fitness_cache is not None else None
+        if fitness is None:
+            pending[key] = [idx]
+        else:
+            results[idx] = (fitness, chromosome if np.isfinite(fitness) else None, None, None)
+
+    keys = list(pending)
+    fold_scores = [[] for _ in keys]
+    finished_folds = [{} for _ in keys]
+    stopped = [False] * len(keys)
+    # Folds are queued fold-major and only n_workers tasks are in flight at a
+    # time, so every individual gets a partial mean early and the remaining
+    # folds of a hopeless one are never submitted.
+    tasks = deque((slot, fold) for fold in range(n_folds) for slot in range(len(keys)))
+    in_flight = {}
+    future_folds = {}
+    while tasks or in_flight:
+        while tasks and len(in_flight) < evaluator.n_workers:
+            slot, fold = tasks.popleft()
+            if not stopped[slot]:
+                future = evaluator.submit((chromosomes[pending[keys[slot]][0]], fold))
+                in_flight[future] = slot
+                future_folds[future] = fold
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            slot = in_flight.pop(future)
+            scores = fold_scores[slot]
+            score, fold_timings = future.result()
+            if timings is not None:
+                timings.add_all(fold_timings)
+            finished_folds[slot][future_folds.pop(future)] = score
+            # Scores are consumed in fold order, so the decision to abandon and
+            # the partial mean do not depend on which worker finished first.
+            while not stopped[slot] and len(scores) in finished_folds[slot]:
+                scores.append(finished_folds[slot][len(scores)])
+                if not np.isfinite(scores[-1]):
+                    stopped[slot] = True
+                elif threshold is not None and score_bound is not None and len(scores) < n_folds:
+                    # Abandon once even perfect scores on the remaining folds
+                    # could not lift the mean to the threshold.
+                    optimistic = (sum(scores) + (n_folds - len(scores)) * score_bound) / n_folds
+                    if optimistic < threshold:
+                        stopped[slot] = True
+
+    # With no elites to fall back on, a high threshold can abandon everyone.
+    # The best partial mean is then scored on its remaining folds, so the
+    # generation still has a fully scored incumbent.
+    if keys and all(result is None for result in results) and all(
+        len(scores) < n_folds and np.isfinite(scores).all() for scores in fold_scores
+    ):
+        leader = max(range(len(keys)), key=lambda slot: np.mean(fold_scores[slot]))
+        chromosome = chromosomes[pending[keys[leader]][0]]
+        futures = [evaluator.submit((chromosome, fold)) for fold in range(len(fold_scores[leader]), n_folds)]
+        for future in futures:
+            score, fold_timings = future.result()
+            if timings is not None:
+                timings.add_all(fold_timings)
+            fold_scores[leader].append(score)
+
+    abandoned = 0
+    for key, scores in zip(keys, fold_scores):
+        fitness = float(np.mean(scores))
+        complete = len(scores) == n_folds or not np.isfinite(fitness)
+        if complete:
+            if fitness_cache is not None:
+                fitness_cache.store(key, fitness)
+        else:
+            abandoned += 1
+        chromosome = chromosomes[pending[key][0]]
+        for idx in pending[key]:
+            # CV scores come without a fitted model; run_ga refits the winner.
+            results[idx] = (fitness, chromosome if np.isfinite(fitness) else None, None, None)
+            # Abandoned individuals rank below fully scored ones, like
+            # screened-out individuals in multi-fidelity mode.
+            fidelities[idx] = 1.0 if complete else len(scores) / n_folds
+    return results, fidelities, abandoned
 
 def run_ga(
     X_train,
@@ -145,100 +342,354 @@ def run_ga(
     population_size=10,
     model_type="random_forest",
     return_model=False,
+    evaluation_backend="serial",
+    n_workers=None,
+    progress_callback=None,
+    cancel_event=None,
+    fitness_cache=None,
+    multi_fidelity=False,
+    fidelity_min_budget=0.25,
+    fidelity_eta=3,
+    patience=None,
+    min_delta=0.0,
+    min_diversity=None,
+    time_budget_seconds=None,
+    max_evaluations=None,
+    elitism=1,
+    mutation_rate=0.1,
+    cv_folds=None,
+    cv_early_abandon=True,
+    initial_genes=None,
+    resume_state=None,
+    checkpoint_callback=None,
+    seed=None,
+    surrogate=False,
+    surrogate_pool_factor=4,
+    surrogate_exploration=1.0,
+    migration=None,
+    evaluation_timeout_seconds=None,
+    evaluation_memory_limit_mb=None,
 ):
-    population = create_population(population_size, model_type)
+    started = time.monotonic()
+    timings = RunTimings()
+    # The population lives in one float array; chromosomes are decoded into
+    # fresh dicts for evaluation, so nothing needs to be deep-copied.
+    schema = GeneSchema(HYPERPARAM_RANGES[model_type])
+    # Every source of randomness in the run derives from one SeedSequence:
+    # the GA operators, the models' random_state and the CV folds. Model
+    # and fold seeds travel with the evaluation payload rather than being
+    # tied to a worker, so results do not depend on the backend, the worker
+    # count or other jobs running alongside.
+    seed_sequence = np.random.SeedSequence(seed)
+    ga_sequence, model_sequence, fold_sequence, surrogate_sequence = seed_sequence.spawn(4)
+    rng = np.random.default_rng(ga_sequence)
+    model_seed = int(model_sequence.generate_state(1)[0])
+    fitness_surrogate = None
+    if surrogate:
+        fitness_surrogate = FitnessSurrogate(
+            schema,
+            exploration=surrogate_exploration,
+            random_state=int(surrogate_sequence.generate_state(1)[0]),
+        )
+    surrogate_pool_size = None
+    genes = schema.sample(population_size, rng)
+    if initial_genes is not None and len(initial_genes):
+        # Warm start: seeded individuals replace the head of the random population.
+        seeded = np.asarray(initial_genes, dtype=float)[:population_size]
+        genes[:len(seeded)] = seeded
     best_chromosome = None
     best_fitness = float('-inf')
     best_model = None
     best_params = None
     generation_scores = []
     generation_details = []
-
-    for gen in range(generations):
-        evaluation_records = []
-        fitnesses = []
-        for individual in population:
-            chromosome = deepcopy(individual)
-            fitness, params, model = evaluate_fitness(
-                chromosome, X_train, X_val, y_train, y_val, model_type
-            )
-            evaluation_records.append(
-                {
-                    "chromosome": chromosome,
-                    "fitness": fitness,
-                    "params": params,
-                    "model": model,
-                }
-            )
-            fitnesses.append(fitness)
-
-        valid_records = [rec for rec in evaluation_records if np.isfinite(rec["fitness"])]
-        if valid_records:
-            best_record = max(valid_records, key=lambda rec: rec["fitness"])
-        else:
-            best_record = max(evaluation_records, key=lambda rec: rec["fitness"])
-
-        max_fitness = best_record["fitness"]
-        if max_fitness > best_fitness:
-            best_fitness = max_fitness
-            best_chromosome = deepcopy(best_record["chromosome"])
-            best_model = best_record["model"]
-            best_params = best_record["params"]
-
-        print(
-            f"Generation {gen+1} | Best Fitness: {max_fitness:.4f} | Params: {best_record['chromosome']}"
+    rungs = budget_rungs(fidelity_min_budget, fidelity_eta) if multi_fidelity else [1.0]
+    stop_reason = "generations"
+    evaluations = 0
+    stale_generations = 0
+    plateau_score = float('-inf')
+    abandon_threshold = None
+    start_generation = 0
+
+    if resume_state is not None:
+        # Pick up exactly where the checkpoint left off: the population it was
+        # about to evaluate and the generator state that produced it.
+        genes = np.asarray(resume_state["genes"], dtype=float)
+        rng.bit_generator.state = resume_state["rng_state"]
+        best_params = resume_state["best_params"]
+        best_chromosome = best_params
+        best_fitness = resume_state["best_fitness"]
+        best_model = resume_state.get("best_model")
+        generation_scores = list(resume_state["generation_scores"])
+        generation_details = list(resume_state["generation_details"])
+        evaluations = resume_state["evaluations"]
+        stale_generations = resume_state["stale_generations"]
+        plateau_score = resume_state["plateau_score"]
+        abandon_threshold = resume_state["abandon_threshold"]
+        start_generation = resume_state["generation"]
+        if fitness_surrogate is not None and len(resume_state.get("history_scores", [])):
+            fitness_surrogate.observe(resume_state["history_genes"], resume_state["history_scores"])
+            if fitness_surrogate.ready:
+                # The checkpointed population was bred through the screen.
+                surrogate_pool_size = (population_size - elitism) * surrogate_pool_factor
+
+    # Only fitness evaluation is dispatched to the backend; selection, crossover
+    # and mutation stay in this process so every backend follows the same
+    # random sequence as the serial run.
+    if n_workers is not None and n_workers > 0:
+        n_workers = min(n_workers, population_size)
+    if cv_folds:
+        # Fold indices are fixed for the whole run and shipped to the workers
+        # once with the training data; each task is a (chromosome, fold) pair.
+        folds = make_folds(y_train, cv_folds, seed=int(fold_sequence.generate_state(1)[0]))
+        is_classification = type_of_target(y_train) in ["binary", "multiclass"]
+        # Accuracy tops out at 1 and negated MSE at 0.
+        score_bound = 1.0 if is_classification else 0.0
+        evaluator = create_evaluator(
+            evaluation_backend,
+            evaluate_fold,
+            (X_train, y_train, folds, model_type, model_seed),
+            n_workers=n_workers,
+            **_evaluation_limits(evaluation_timeout_seconds, evaluation_memory_limit_mb, (float('-inf'), None)),
+        )
+    else:
+        evaluator = create_evaluator(
+            evaluation_backend,
+            evaluate_fitness,
+            (X_train, X_val, y_train, y_val, model_type, model_seed),
+            n_workers=n_workers,
+            **_evaluation_limits(evaluation_timeout_seconds, evaluation_memory_limit_mb, LIMIT_PENALTY),
+        )
+    limited = evaluation_backend == "isolated"
+    timed_out_evaluations = 0
+    crashed_evaluations = 0
+
+    carried_elites = {}
+    if multi_fidelity and resume_state is not None:
+        # Rebuilt from the last evaluated generation exactly as the run would
+        # have carried them; only the fitted models are not kept.
+        resumed_results = [
+            (float(fitness), schema.decode(row) if np.isfinite(fitness) else None, None, None)
+            for row, fitness in zip(resume_state["evaluated_genes"], resume_state["fitnesses"])
+        ]
+        carried_elites = _carry_elites(
+            genes,
+            resume_state["evaluated_genes"],
+            resumed_results,
+            resume_state["fidelities"],
+            resume_state["fitnesses"],
+            elitism,
         )
+    with evaluator:
+        for gen in range(start_generation, generations):
+            if cancel_event is not None and cancel_event.is_set():
+                raise OptimizationCancelled(f"Optimization cancelled before generation {gen + 1}.")
+
+            generation_started = time.perf_counter()
+            evaluation_records = []
+            fitnesses = []
+            chromosomes = schema.decode_all(genes)
+            with timings.phase("evaluation"):
+                if multi_fidelity:
+                    results, fidelities, evaluations_per_rung = _successive_halving(
+                        chromosomes, evaluator, fitness_cache, rungs, fidelity_eta, timings, carried_elites
+                    )
+                elif cv_folds:
+                    results, fidelities, abandoned = _cross_validate_population(
+                        chromosomes, evaluator, cv_folds, fitness_cache, abandon_threshold, score_bound, timings
+                    )
+                else:
+                    results = _evaluate_population(chromosomes, evaluator, fitness_cache, timings=timings)
+                    fidelities = [1.0] * len(chromosomes)
+            for chromosome, (fitness, params, model, _), fidelity in zip(chromosomes, results, fidelities):
+                evaluation_records.append(
+                    {
+                        "chromosome": chromosome,
+                        "fitness": fitness,
+                        "params": params,
+                        "model": model,
+                        "fidelity": fidelity,
+                    }
+                )
+                fitnesses.append(fitness)
+
+            # Statistics and the incumbent only consider full-fidelity scores.
+            full_records = [rec for rec in evaluation_records if rec["fidelity"] >= 1.0]
+            valid_records = [rec for rec in full_records if np.isfinite(rec["fitness"])]
+            if valid_records:
+                best_record = max(valid_records, key=lambda rec: rec["fitness"])
+            else:
+                best_record = max(full_records, key=lambda rec: rec["fitness"])
+
+            generation_evaluations = sum(evaluations_per_rung) if multi_fidelity else len(chromosomes)
+            evaluations += generation_evaluations
+            diversity = population_diversity(genes)
+
+            max_fitness = best_record["fitness"]
+            # Patience counts generations without an improvement of more than
+            # min_delta over the best score seen so far.
+            if max_fitness > plateau_score + min_delta:
+                plateau_score = max_fitness
+                stale_generations = 0
+            else:
+                stale_generations += 1
+            best_improved = max_fitness > best_fitness
+            if best_improved:
+                best_fitness = max_fitness
+                best_chromosome = best_record["chromosome"]
+                best_model = best_record["model"]
+                best_params = best_record["params"]
+
+            logger.info(
+                "Generation %d | Best Fitness: %.4f | Params: %s", gen + 1, max_fitness, best_record["chromosome"]
+            )
 
-        finite_scores = [rec["fitness"] for rec in valid_records]
-        generation_scores.append(max_fitness if np.isfinite(max_fitness) else 0.0)
+            finite_scores = [rec["fitness"] for rec in valid_records]
+            generation_scores.append(max_fitness if np.isfinite(max_fitness) else 0.0)
 
-        sorted_candidates = sorted(
-            (valid_records or evaluation_records),
-            key=lambda rec: rec["fitness"],
-            reverse=True,
-        )
-        top_candidates = []
-        for idx, candidate in enumerate(sorted_candidates[:3]):
-            top_candidates.append(
+            sorted_candidates = sorted(
+                (valid_records or full_records),
+                key=lambda rec: rec["fitness"],
+                reverse=True,
+            )
+            top_candidates = []
+            for idx, candidate in enumerate(sorted_candidates[:3]):
+                top_candidates.append(
+                    {
+                        "rank": idx + 1,
+                        "score": candidate["fitness"] if np.isfinite(candidate["fitness"]) else None,
+                        "params": dict(candidate["chromosome"]),
+                    }
+                )
+
+            generation_details.append(
                 {
-                    "rank": idx + 1,
-                    "score": candidate["fitness"] if np.isfinite(candidate["fitness"]) else None,
-                    "params": deepcopy(candidate["chromosome"]),
+                    "generation": gen + 1,
+                    "best_score": max_fitness if np.isfinite(max_fitness) else None,
+                    "average_score": float(np.mean(finite_scores)) if finite_scores else None,
+                    "median_score": float(np.median(finite_scores)) if finite_scores else None,
+                    "std_dev": float(np.std(finite_scores)) if len(finite_scores) > 1 else 0.0 if finite_scores else None,
+                    "top_candidates": top_candidates,
+                    "diversity": diversity,
+                    "evaluations": evaluations,
+                    "wall_seconds": time.perf_counter() - generation_started,
                 }
             )
-
-        generation_details.append(
-            {
-                "generation": gen + 1,
-                "best_score": max_fitness if np.isfinite(max_fitness) else None,
-                "average_score": float(np.mean(finite_scores)) if finite_scores else None,
-                "median_score": float(np.median(finite_scores)) if finite_scores else None,
-                "std_dev": float(np.std(finite_scores)) if len(finite_scores) > 1 else 0.0 if finite_scores else None,
-                "top_candidates": top_candidates,
-            }
-        )
-
-        population_chromosomes = [deepcopy(rec["chromosome"]) for rec in evaluation_records]
-        selected = selection(population_chromosomes, fitnesses)
-        next_population = []
-
-        for i in range(0, population_size, 2):
-            parent1 = deepcopy(selected[i % len(selected)])
-            parent2 = deepcopy(selected[(i + 1) % len(selected)])
-            child1, child2 = crossover(parent1, parent2)
-            next_population.append(mutate(deepcopy(child1), model_type))
-            next_population.append(mutate(deepcopy(child2), model_type))
-
-        population = next_population[:population_size]
+            if multi_fidelity:
+                generation_details[-1]["evaluations_per_rung"] = evaluations_per_rung
+            if surrogate_pool_size is not None:
+                generation_details[-1]["surrogate_pool_size"] = surrogate_pool_size
+            if limited:
+                generation_details[-1]["timed_out_evaluations"] = evaluator.timeouts - timed_out_evaluations
+                generation_details[-1]["crashed_evaluations"] = evaluator.crashes - crashed_evaluations
+                timed_out_evaluations, crashed_evaluations = evaluator.timeouts, evaluator.crashes
+            if cv_folds:
+                generation_details[-1]["abandoned_evaluations"] = abandoned
+                # Next generation's individuals are dropped once they cannot
+                # reach this generation's median.
+                if cv_early_abandon and finite_scores:
+                    abandon_threshold = float(np.median(finite_scores))
+            if progress_callback is not None:
+                progress_callback(generation_details[-1])
+
+            if gen + 1 < generations:
+                if patience is not None and stale_generations >= patience:
+                    stop_reason = "patience"
+                elif min_diversity is not None and diversity <= min_diversity:
+                    stop_reason = "diversity_collapse"
+                elif time_budget_seconds is not None and time.monotonic() - started >= time_budget_seconds:
+                    stop_reason = "time_budget"
+                elif max_evaluations is not None and evaluations + generation_evaluations > max_evaluations:
+                    # Stop before a generation that would overrun the cap.
+                    stop_reason = "max_evaluations"
+
+            evaluated_genes = genes
+            screen = None
+            surrogate_pool_size = None
+            if fitness_surrogate is not None:
+                # Only full-fidelity scores are comparable, so screened-out
+                # rungs and abandoned CV folds stay out of the history.
+                full = np.asarray(fidelities) >= 1.0
+                with timings.phase("surrogate_fit"):
+                    fitness_surrogate.observe(genes[full], np.asarray(fitnesses, dtype=float)[full])
+                if fitness_surrogate.ready:
+                    screen = fitness_surrogate.screen
+                    surrogate_pool_size = (population_size - elitism) * surrogate_pool_factor
+            # The next population is bred even when stopping, so a checkpoint
+            # can always be resumed with more generations.
+            genes = next_generation(
+                genes,
+                fitness_ranks(fidelities, fitnesses),
+                schema,
+                rng,
+                elitism=elitism,
+                mutation_rate=mutation_rate,
+                screen=screen,
+                pool_factor=surrogate_pool_factor,
+                timings=timings,
+            )
+            if migration is not None:
+                # Island runs swap their best individuals for part of the
+                # freshly bred population.
+                with timings.phase("migration"):
+                    genes = migration(gen + 1, evaluated_genes, fitness_ranks(fidelities, fitnesses), genes)
+            if multi_fidelity:
+                carried_elites = _carry_elites(genes, evaluated_genes, results, fidelities, fitnesses, elitism)
+
+            if checkpoint_callback is not None:
+                with timings.phase("checkpoint"):
+                    checkpoint_callback(
+                        {
+                            "generation": gen + 1,
+                            "genes": genes,
+                            "evaluated_genes": evaluated_genes,
+                            "fitnesses": fitnesses,
+                            "fidelities": fidelities,
+                            "rng_state": rng.bit_generator.state,
+                            "best_params": best_params,
+                            "best_fitness": best_fitness,
+                            "best_model": best_model,
+                            "best_improved": best_improved,
+                            "generation_scores": generation_scores,
+                            "generation_details": generation_details,
+                            "evaluations": evaluations,
+                            "stale_generations": stale_generations,
+                            "plateau_score": plateau_score,
+                            "abandon_threshold": abandon_threshold,
+                            "stop_reason": stop_reason,
+                            "history_genes": fitness_surrogate.history_genes if fitness_surrogate is not None else None,
+                            "history_scores": fitness_surrogate.history_scores if fitness_surrogate is not None else None,
+                        }
+                    )
+
+            if stop_reason != "generations":
+                logger.info("Stopping after generation %d: %s", gen + 1, stop_reason)
+                break
+
+    # Cached and CV-scored winners have no fitted model, and search fits of
+    # some models are cut down; either way the winner is retrained here.
+    if return_model and best_params is not None and (best_model is None or model_type in FINAL_REFIT_MODELS):
+        with timings.phase("final_fit"):
+            best_model = train_model(best_params, X_train, y_train, model_type, random_state=model_seed)
 
     if best_chromosome is None:
-        print("❌ No valid solution found.")
+        logger.warning("No valid solution found.")
     else:
-        print("\n✅ Final Best Solution:")
-        print(f"Best Fitness: {best_fitness:.4f}")
-        print(f"Best Params: {best_params}")
+        logger.info("Final best fitness: %.4f | Params: %s", best_fitness, best_params)
+
+    run_summary = {
+        "seed": seed_sequence.entropy,
+        "stop_reason": stop_reason,
+        "generations_run": len(generation_details),
+        "evaluations": evaluations,
+        "elapsed_seconds": time.monotonic() - started,
+        "timings": timings.as_dict(),
+    }
+    if limited:
+        run_summary["timed_out_evaluations"] = evaluator.timeouts
+        run_summary["crashed_evaluations"] = evaluator.crashes
 
     if return_model:
-        return best_params, best_fitness, generation_scores, best_model, generation_details
+        return best_params, best_fitness, generation_scores, best_model, generation_details, run_summary
 
-    return best_params, best_fitness, generation_scores, generation_details
+    return best_params, best_fitness, generation_scores, generation_details, run_summary
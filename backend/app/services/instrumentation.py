@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+METRIC_PREFIX = "hpo"
+
+
+class RunTimings:
+    """Wall-clock seconds and event counts per named phase of one run.
+
+    Phases are plain strings ("fit", "predict", "selection", ...). Evaluation
+    timings measured inside workers come back with the results and are
+    folded in with `add_all`, so the totals cover every backend.
+    """
+
+    def __init__(self):
+        self._seconds: Dict[str, float] = defaultdict(float)
+        self._counts: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float, count: int = 1) -> None:
+        self._seconds[name] += seconds
+        self._counts[name] += count
+
+    def add_all(self, timings: Optional[Dict[str, float]]) -> None:
+        for name, seconds in (timings or {}).items():
+            self.add(name, seconds)
+
+    def merge(self, summary: Dict[str, Dict[str, Any]]) -> None:
+        for name, entry in summary.items():
+            self.add(name, entry["seconds"], entry["count"])
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"seconds": self._seconds[name], "count": self._counts[name]}
+            for name in sorted(self._seconds)
+        }
+
+
+def timed(timings: Optional[RunTimings], name: str):
+    return timings.phase(name) if timings is not None else nullcontext()
+
+
+class MetricsRegistry:
+    """Process-wide counters and phase summaries in Prometheus text format.
+
+    Only the plain exposition format is needed for scraping, so this keeps
+    the service free of a client library dependency.
+    """
+
+    def __init__(self, prefix: str = METRIC_PREFIX):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = defaultdict(float)
+        self._help: Dict[str, str] = {}
+        self._phase_seconds: Dict[str, float] = defaultdict(float)
+        self._phase_counts: Dict[str, int] = defaultdict(int)
+
+    def increment(self, name: str, amount: float = 1, help_text: str = "", **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += amount
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def observe_run(self, timings: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            for phase, entry in timings.items():
+                self._phase_seconds[phase] += entry["seconds"]
+                self._phase_counts[phase] += entry["count"]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            phases = sorted(self._phase_seconds)
+            seen = set()
+            for (name, labels), value in counters:
+                metric = f"{self.prefix}_{name}"
+                if name not in seen:
+                    seen.add(name)
+                    if name in self._help:
+                        lines.append(f"# HELP {metric} {self._help[name]}")
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+
+            metric = f"{self.prefix}_phase_seconds"
+            lines.append(f"# HELP {metric} Wall-clock seconds spent per optimization phase.")
+            lines.append(f"# TYPE {metric} summary")
+            for phase in phases:
+                labels = _format_labels((("phase", phase),))
+                lines.append(f"{metric}_sum{labels} {_format_value(self._phase_seconds[phase])}")
+                lines.append(f"{metric}_count{labels} {self._phase_counts[phase]}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{key}="{_escape_label(value)}"' for key, value in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+metrics = MetricsRegistry()
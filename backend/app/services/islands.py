@@ -0,0 +1,333 @@
+import json
+import multiprocessing
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .evaluation import resolve_worker_count
+from .genetic_algorithm import OptimizationCancelled, run_ga
+from .instrumentation import RunTimings
+
+ISLAND_TRANSPORTS = ("queue", "tcp")
+MIGRATION_TIMEOUT_SECONDS = 600
+EVENT_POLL_SECONDS = 0.5
+
+
+class QueueTransport:
+    """One multiprocessing queue per island, used as that island's inbox."""
+
+    def __init__(self, n_islands: int, context):
+        self._inboxes = [context.Queue() for _ in range(n_islands)]
+
+    def send(self, island: int, message: Dict[str, Any]) -> None:
+        self._inboxes[island].put(message)
+
+    def receive(self, island: int, timeout: float) -> Dict[str, Any]:
+        try:
+            return self._inboxes[island].get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No migrants reached island {island} within {timeout}s.") from None
+
+    def close(self) -> None:
+        pass
+
+
+class _MailboxHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        mailbox = self.server.mailbox
+        if request["op"] == "put":
+            mailbox.put(request["island"], request["message"])
+            reply = {"ok": True}
+        else:
+            reply = {"message": mailbox.get(request["island"], request["timeout"])}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class _Mailbox:
+    def __init__(self):
+        self._messages = defaultdict(deque)
+        self._condition = threading.Condition()
+
+    def put(self, island: int, message: Dict[str, Any]) -> None:
+        with self._condition:
+            self._messages[island].append(message)
+            self._condition.notify_all()
+
+    def get(self, island: int, timeout: float) -> Optional[Dict[str, Any]]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._messages[island], timeout=timeout)
+            return self._messages[island].popleft() if self._messages[island] else None
+
+
+class _MailboxServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class TcpTransport:
+    """Newline-delimited JSON mailbox over local TCP.
+
+    The parent hosts the mailbox and islands talk to it over sockets, so the
+    same protocol works when islands live on other hosts. A Redis list per
+    island would be a drop-in replacement with the same send/receive calls.
+    """
+
+    def __init__(self, n_islands: int, context=None, host: str = "127.0.0.1", port: int = 0):
+        self._server = _MailboxServer((host, port), _MailboxHandler)
+        self._server.mailbox = _Mailbox()
+        self.address = self._server.server_address
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def __getstate__(self):
+        # Only the address travels to the island processes.
+        return {"address": self.address}
+
+    def __setstate__(self, state):
+        self.address = tuple(state["address"])
+        self._server = None
+
+    def _request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        with socket.create_connection(self.address, timeout=timeout + 5) as connection:
+            connection.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            return json.loads(connection.makefile("rb").readline())
+
+    def send(self, island: int, message: Dict[str, Any]) -> None:
+        self._request({"op": "put", "island": island, "message": message}, MIGRATION_TIMEOUT_SECONDS)
+
+    def receive(self, island: int, timeout: float) -> Dict[str, Any]:
+        message = self._request({"op": "get", "island": island, "timeout": timeout}, timeout)["message"]
+        if message is None:
+            raise TimeoutError(f"No migrants reached island {island} within {timeout}s.")
+        return message
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+_TRANSPORT_CLASSES = {
+    "queue": QueueTransport,
+    "tcp": TcpTransport,
+}
+
+
+def create_transport(name: str, n_islands: int, context):
+    if name not in _TRANSPORT_CLASSES:
+        raise ValueError(f"Unsupported island transport '{name}'. Choose one of: {', '.join(ISLAND_TRANSPORTS)}.")
+    return _TRANSPORT_CLASSES[name](n_islands, context)
+
+
+class RingMigration:
+    """run_ga migration hook: every `interval` generations an island sends
+    its best individuals to the next island in the ring and replaces the tail
+    of its new population with the migrants it receives.
+
+    Receiving blocks until the upstream island reaches the same generation,
+    so migration is synchronous and island runs stay reproducible.
+    """
+
+    def __init__(self, island: int, n_islands: int, transport, interval: int, size: int, generations: int):
+        self.island = island
+        self.downstream = (island + 1) % n_islands
+        self.transport = transport
+        self.interval = interval
+        self.size = size
+        self.generations = generations
+        self.upstream_done = False
+        self.received = 0
+
+    def __call__(self, generation: int, evaluated_genes: np.ndarray, ranks: np.ndarray, genes: np.ndarray) -> np.ndarray:
+        if generation % self.interval or generation >= self.generations:
+            return genes
+        best = evaluated_genes[np.argsort(ranks)[::-1][: self.size]]
+        self.transport.send(self.downstream, {"generation": generation, "genes": best.tolist()})
+        if self.upstream_done:
+            return genes
+
+        message = self.transport.receive(self.island, MIGRATION_TIMEOUT_SECONDS)
+        if message.get("done"):
+            # The upstream island stopped early; carry on without migrants.
+            self.upstream_done = True
+            return genes
+        migrants = np.asarray(message["genes"], dtype=float)[: len(genes)]
+        genes = genes.copy()
+        genes[len(genes) - len(migrants):] = migrants
+        self.received += len(migrants)
+        return genes
+
+    def finish(self) -> None:
+        self.transport.send(self.downstream, {"done": True})
+
+
+def _run_island(island, n_islands, transport, data, options, interval, size, events) -> None:
+    migration = RingMigration(island, n_islands, transport, interval, size, options["generations"])
+
+    def on_generation(record):
+        events.put(("generation", island, record))
+
+    try:
+        result = run_ga(*data, return_model=True, progress_callback=on_generation, migration=migration, **options)
+        result[-1]["migrants_received"] = migration.received
+        events.put(("result", island, result))
+    except Exception as exc:
+        events.put(("error", island, f"{type(exc).__name__}: {exc}"))
+    finally:
+        migration.finish()
+
+
+def _merge_generation(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def values(key):
+        return [record[key] for record in records if record.get(key) is not None]
+
+    best_scores = values("best_score")
+    candidates = sorted(
+        (candidate for record in records for candidate in record["top_candidates"] if candidate["score"] is not None),
+        key=lambda candidate: candidate["score"],
+        reverse=True,
+    )
+    merged = {
+        "generation": records[0]["generation"],
+        "best_score": max(best_scores) if best_scores else None,
+        "average_score": float(np.mean(values("average_score"))) if values("average_score") else None,
+        "median_score": float(np.median(values("median_score"))) if values("median_score") else None,
+        "std_dev": float(np.mean(values("std_dev"))) if values("std_dev") else None,
+        "top_candidates": [{**candidate, "rank": idx + 1} for idx, candidate in enumerate(candidates[:3])],
+        "diversity": float(np.mean(values("diversity"))),
+        "evaluations": int(sum(values("evaluations"))),
+        # Islands run side by side, so a generation takes as long as the slowest.
+        "wall_seconds": max(values("wall_seconds"), default=0.0),
+        "island_best_scores": [record.get("best_score") for record in records],
+    }
+    for key in ("timed_out_evaluations", "crashed_evaluations"):
+        if key in records[0]:
+            merged[key] = int(sum(values(key)))
+    return merged
+
+
+def run_islands(
+    X_train,
+    y_train,
+    X_val,
+    y_val,
+    n_islands=2,
+    migration_interval=2,
+    migration_size=1,
+    transport="queue",
+    seed=None,
+    progress_callback=None,
+    cancel_event=None,
+    **options,
+):
+    started = time.monotonic()
+    # n_workers is the budget for the whole run, so islands share the cores
+    # instead of each starting a full pool.
+    options["n_workers"] = max(1, resolve_worker_count(options.get("n_workers")) // n_islands)
+    # Each island is a separate process with its own seed; spawn avoids
+    # forking the server's threads.
+    context = multiprocessing.get_context("spawn")
+    island_transport = create_transport(transport, n_islands, context)
+    events = context.Queue()
+    seed_sequence = np.random.SeedSequence(seed)
+    island_seeds = [int(child.generate_state(1)[0]) for child in seed_sequence.spawn(n_islands)]
+    processes = [
+        context.Process(
+            target=_run_island,
+            args=(
+                island,
+                n_islands,
+                island_transport,
+                (X_train, y_train, X_val, y_val),
+                {**options, "seed": island_seeds[island]},
+                migration_interval,
+                migration_size,
+                events,
+            ),
+            # Not daemonic, so islands can use process-based evaluation
+            # backends; the finally block below always reaps them.
+            daemon=False,
+        )
+        for island in range(n_islands)
+    ]
+
+    results: Dict[int, Any] = {}
+    reported: Dict[int, Dict[int, Dict[str, Any]]] = defaultdict(dict)
+    generation_details: List[Dict[str, Any]] = []
+    try:
+        for process in processes:
+            process.start()
+
+        while len(results) < n_islands:
+            if cancel_event is not None and cancel_event.is_set():
+                raise OptimizationCancelled("Optimization cancelled during island search.")
+            try:
+                kind, island, payload = events.get(timeout=EVENT_POLL_SECONDS)
+            except queue.Empty:
+                if any(not process.is_alive() and island not in results for island, process in enumerate(processes)):
+                    # Give a late result a moment to arrive before giving up.
+                    time.sleep(EVENT_POLL_SECONDS)
+                    if events.empty():
+                        raise RuntimeError("An island process exited without reporting a result.")
+                continue
+            if kind == "error":
+                raise RuntimeError(f"Island {island} failed: {payload}")
+            if kind == "generation":
+                reported[payload["generation"]][island] = payload
+            else:
+                results[island] = payload
+
+            # A generation is complete once every island has reported it or
+            # has already finished (islands can stop early).
+            while True:
+                generation = len(generation_details) + 1
+                records = reported.get(generation, {})
+                if not records or any(island not in records and island not in results for island in range(n_islands)):
+                    break
+                generation_details.append(_merge_generation([records[island] for island in sorted(records)]))
+                if progress_callback is not None:
+                    progress_callback(generation_details[-1])
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout=5)
+        island_transport.close()
+
+    best_island = max(results, key=lambda island: results[island][1])
+    best_params, best_fitness, _, best_model, _, _ = results[best_island]
+    summaries = [results[island][-1] for island in range(n_islands)]
+    longest = max(summaries, key=lambda summary: summary["generations_run"])
+    timings = RunTimings()
+    for summary in summaries:
+        timings.merge(summary["timings"])
+    run_summary = {
+        "seed": seed_sequence.entropy,
+        "stop_reason": longest["stop_reason"],
+        "generations_run": len(generation_details),
+        "evaluations": sum(summary["evaluations"] for summary in summaries),
+        "elapsed_seconds": time.monotonic() - started,
+        "islands": [
+            {
+                "island": island,
+                "best_score": results[island][1],
+                "stop_reason": summary["stop_reason"],
+                "generations_run": summary["generations_run"],
+                "migrants_received": summary["migrants_received"],
+            }
+            for island, summary in enumerate(summaries)
+        ],
+        "best_island": best_island,
+        "timings": timings.as_dict(),
+    }
+    for key in ("timed_out_evaluations", "crashed_evaluations"):
+        if key in summaries[0]:
+            run_summary[key] = sum(summary[key] for summary in summaries)
+    generation_scores = [detail["best_score"] if detail["best_score"] is not None else 0.0 for detail in generation_details]
+    return best_params, best_fitness, generation_scores, best_model, generation_details, run_summary
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.optimization_request import OptimizationRequest
+from .checkpoints import load_checkpoint_meta
+from .genetic_algorithm import OptimizationCancelled
+from .instrumentation import metrics
+from .optimizer import format_generation_detail, run_optimization
+
+MAX_CONCURRENT_JOBS = int(os.environ.get("MAX_CONCURRENT_JOBS", "2"))
+MAX_RETAINED_JOBS = int(os.environ.get("MAX_RETAINED_JOBS", "100"))
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class OptimizationJob:
+    def __init__(self, req, resume_from: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.request = req
+        self.resume_from = resume_from
+        self.status = "queued"
+        self.progress: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = _utc_now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self, include_progress: bool = True) -> Dict[str, Any]:
+        payload = {
+            "job_id": self.id,
+            "status": self.status,
+            "dataset_id": self.request.dataset_id,
+            "model_type": self.request.model_type,
+            "target_column": self.request.target_column,
+            "generations_completed": len(self.progress),
+            "total_generations": self.request.generations,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "resumed_from": self.resume_from,
+            "status_url": f"/optimize/jobs/{self.id}",
+            "result_url": f"/optimize/jobs/{self.id}/result",
+            "resume_url": f"/optimize/jobs/{self.id}/resume",
+        }
+        if include_progress:
+            payload["progress"] = list(self.progress)
+        return payload
+
+    def summary(self) -> Dict[str, Any]:
+        payload = self.to_dict(include_progress=False)
+        if self.result is not None:
+            payload["best_score"] = self.result.get("best_score")
+            payload["best_params"] = self.result.get("best_params")
+            payload["model_asset"] = self.result.get("model_asset")
+        return payload
+
+    def subscribe(self) -> asyncio.Queue:
+        # Called from the event loop. Generations that already finished are
+        # replayed first so late subscribers see the whole run.
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            for record in self.progress:
+                queue.put_nowait(("generation", record))
+            if self.finished:
+                queue.put_nowait(("end", self.summary()))
+            else:
+                self._subscribers.append((loop, queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = [sub for sub in self._subscribers if sub[1] is not queue]
+
+    def record_generation(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.progress.append(record)
+            self._publish("generation", record)
+
+    def start(self) -> bool:
+        # Checked and switched under the lock, so a concurrent cancel either
+        # sees the job still queued or not at all.
+        with self._lock:
+            if self.status != "queued" or self.cancel_event.is_set():
+                return False
+            self.status = "running"
+            self.started_at = _utc_now()
+            return True
+
+    def mark_finished(self, status: str, error: Optional[str] = None, only_if_queued: bool = False) -> bool:
+        with self._lock:
+            if self.finished or (only_if_queued and self.status != "queued"):
+                return False
+            self.status = status
+            self.error = error
+            self.finished_at = _utc_now()
+            self._publish("end", self.summary())
+            self._subscribers = []
+            return True
+
+    def _publish(self, event: str, payload: Dict[str, Any]) -> None:
+        for loop, queue in self._subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (event, payload))
+            except RuntimeError:
+                # The subscriber's event loop is already closed.
+                pass
+
+
+class JobManager:
+    def __init__(self, max_concurrent_jobs: int = MAX_CONCURRENT_JOBS, max_retained_jobs: int = MAX_RETAINED_JOBS):
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.max_retained_jobs = max_retained_jobs
+        # Jobs beyond the concurrency cap wait in the executor queue as "queued".
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_jobs,
+            thread_name_prefix="optimization-job",
+        )
+        self._jobs: "OrderedDict[str, OptimizationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, req, resume_from: Optional[str] = None, progress: Optional[List[Dict[str, Any]]] = None) -> OptimizationJob:
+        job = OptimizationJob(req, resume_from=resume_from)
+        job.progress = list(progress or [])
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished_jobs()
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def resume(self, checkpoint_id: str, additional_generations: int = 0) -> Optional[OptimizationJob]:
+        # Checkpoints outlive the in-memory job table, so a run interrupted by
+        # a restart can be continued from its last completed generation.
+        meta = load_checkpoint_meta(checkpoint_id)
+        if meta is None:
+            return None
+        payload = dict(meta["request"])
+        payload["generations"] = payload["generations"] + additional_generations
+        # Earlier generations are replayed to subscribers of the new job.
+        return self.submit(
+            OptimizationRequest(**payload),
+            resume_from=checkpoint_id,
+            progress=[format_generation_detail(record) for record in meta["generation_details"]],
+        )
+
+    def get(self, job_id: str) -> Optional[OptimizationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[OptimizationJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[OptimizationJob]:
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.cancel_event.set()
+        # A job still waiting for a slot is skipped when its turn comes; a
+        # running job stops at the next generation boundary.
+        self._finish(job, "cancelled", only_if_queued=True)
+        return job
+
+    def _run(self, job: OptimizationJob) -> OptimizationJob:
+        if not job.start():
+            self._finish(job, "cancelled")
+            return job
+
+        def on_generation(record: Dict[str, Any]) -> None:
+            job.record_generation(format_generation_detail(record))
+
+        try:
+            result = run_optimization(
+                job.request,
+                progress_callback=on_generation,
+                cancel_event=job.cancel_event,
+                checkpoint_id=job.id,
+                resume_from=job.resume_from,
+            )
+        except OptimizationCancelled:
+            self._finish(job, "cancelled")
+            return job
+        except Exception as exc:
+            logger.exception("Optimization job %s failed", job.id)
+            self._finish(job, "failed", error=str(exc))
+            return job
+
+        if "error" in result:
+            self._finish(job, "failed", error=result["error"])
+        else:
+            job.result = result
+            self._finish(job, "completed")
+        return job
+
+    def _finish(
+        self, job: OptimizationJob, status: str, error: Optional[str] = None, only_if_queued: bool = False
+    ) -> None:
+        # Only the call that actually finishes the job publishes and counts it.
+        if job.mark_finished(status, error=error, only_if_queued=only_if_queued):
+            metrics.increment("optimization_jobs_total", help_text="Optimization jobs by final status.", status=status)
+
+    def _evict_finished_jobs(self) -> None:
+        excess = len(self._jobs) - self.max_retained_jobs
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[job_id]
+
+
+job_manager = JobManager()
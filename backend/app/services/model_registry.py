@@ -0,0 +1,286 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MODEL_STORAGE_DIR = Path("app/storage/models")
+MODEL_REGISTRY_PATH = Path("app/storage/model_registry.sqlite3")
+# Retention limits; 0 disables a limit.
+MODEL_RETENTION_MAX_MODELS = int(os.environ.get("MODEL_RETENTION_MAX_MODELS", "0"))
+MODEL_RETENTION_MAX_AGE_DAYS = float(os.environ.get("MODEL_RETENTION_MAX_AGE_DAYS", "0"))
+MODEL_RETENTION_MAX_BYTES = int(os.environ.get("MODEL_RETENTION_MAX_BYTES", "0"))
+
+MODEL_ORDERINGS = {
+    "newest": "created_at DESC",
+    "oldest": "created_at ASC",
+    "best_score": "score DESC",
+    "largest": "size_bytes DESC",
+}
+
+_MODEL_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+_LEGACY_FILE_PATTERN = re.compile(r"^([0-9a-f]{32})_(.+)\.joblib$")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS models (
+        model_id TEXT PRIMARY KEY,
+        file_name TEXT NOT NULL,
+        model_type TEXT NOT NULL,
+        task_type TEXT,
+        dataset_id TEXT,
+        target_column TEXT,
+        score REAL,
+        params TEXT,
+        search_configuration TEXT,
+        job_id TEXT,
+        compression TEXT,
+        feature_names TEXT,
+        target_classes TEXT,
+        size_bytes INTEGER NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS models_dataset ON models (dataset_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS models_type ON models (model_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS models_created ON models (created_at)",
+)
+# Columns added after the first release; older databases are migrated on open.
+_ADDED_COLUMNS = (("compression", "TEXT"), ("feature_names", "TEXT"), ("target_classes", "TEXT"))
+
+
+def is_valid_model_id(model_id: str) -> bool:
+    return bool(_MODEL_ID_PATTERN.match(model_id))
+
+
+class ModelRegistry:
+    """SQLite index of the exported models.
+
+    Downloads look a model up by its primary key instead of scanning the
+    models directory, and every row keeps the dataset, target, parameters
+    and score the model came from. Retention limits are applied after each
+    registration, oldest models first.
+    """
+
+    def __init__(
+        self,
+        models_dir: Path = MODEL_STORAGE_DIR,
+        db_path: Path = MODEL_REGISTRY_PATH,
+        max_models: int = MODEL_RETENTION_MAX_MODELS,
+        max_age_days: float = MODEL_RETENTION_MAX_AGE_DAYS,
+        max_bytes: int = MODEL_RETENTION_MAX_BYTES,
+    ):
+        self.models_dir = models_dir
+        self.db_path = db_path
+        self.max_models = max_models
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def path(self, record: Dict[str, Any]) -> Path:
+        return self.models_dir / record["file_name"]
+
+    def register(
+        self,
+        model_id: str,
+        file_name: str,
+        model_type: str,
+        task_type: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        target_column: Optional[str] = None,
+        score: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None,
+        search_configuration: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+        compression: Optional[str] = None,
+        feature_names: Optional[List[str]] = None,
+        target_classes: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        size_bytes = (self.models_dir / file_name).stat().st_size
+        with self._lock:
+            connection = self._db()
+            connection.execute(
+                "INSERT OR REPLACE INTO models (model_id, file_name, model_type, task_type, dataset_id, target_column,"
+                " score, params, search_configuration, job_id, compression, feature_names, target_classes,"
+                " size_bytes, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    model_id,
+                    file_name,
+                    model_type,
+                    task_type,
+                    dataset_id,
+                    target_column,
+                    score,
+                    json.dumps(params) if params is not None else None,
+                    json.dumps(search_configuration) if search_configuration is not None else None,
+                    job_id,
+                    compression,
+                    json.dumps(feature_names) if feature_names is not None else None,
+                    json.dumps(target_classes) if target_classes is not None else None,
+                    size_bytes,
+                    time.time(),
+                ),
+            )
+            connection.commit()
+            self._enforce_retention(keep=model_id)
+        return self.get(model_id)
+
+    def get(self, model_id: str) -> Optional[Dict[str, Any]]:
+        if not is_valid_model_id(model_id):
+            return None
+        with self._lock:
+            row = self._db().execute("SELECT * FROM models WHERE model_id = ?", (model_id,)).fetchone()
+        return _record(row) if row is not None else None
+
+    def query(
+        self,
+        dataset_id: Optional[str] = None,
+        model_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        min_score: Optional[float] = None,
+        order_by: str = "newest",
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        if order_by not in MODEL_ORDERINGS:
+            raise ValueError(f"Unsupported ordering '{order_by}'. Choose one of: {', '.join(MODEL_ORDERINGS)}.")
+        clauses, values = [], []
+        for column, value in (("dataset_id", dataset_id), ("model_type", model_type), ("task_type", task_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+        if min_score is not None:
+            clauses.append("score >= ?")
+            values.append(min_score)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            connection = self._db()
+            total = connection.execute(f"SELECT COUNT(*) FROM models{where}", values).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT * FROM models{where} ORDER BY {MODEL_ORDERINGS[order_by]} LIMIT ? OFFSET ?",
+                [*values, limit, offset],
+            ).fetchall()
+        return {"total": total, "models": [_record(row) for row in rows]}
+
+    def delete(self, model_id: str) -> bool:
+        with self._lock:
+            row = self._db().execute("SELECT file_name FROM models WHERE model_id = ?", (model_id,)).fetchone()
+            if row is None:
+                return False
+            self._remove([(model_id, row["file_name"])])
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total_bytes = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM models"
+            ).fetchone()
+        return {
+            "models": count,
+            "total_bytes": total_bytes,
+            "retention": {
+                "max_models": self.max_models or None,
+                "max_age_days": self.max_age_days or None,
+                "max_bytes": self.max_bytes or None,
+            },
+        }
+
+    def enforce_retention(self) -> List[str]:
+        with self._lock:
+            return self._enforce_retention()
+
+    def _enforce_retention(self, keep: Optional[str] = None) -> List[str]:
+        connection = self._db()
+        evicted = []
+        if self.max_age_days > 0:
+            cutoff = time.time() - self.max_age_days * 86400
+            evicted += connection.execute(
+                "SELECT model_id, file_name FROM models WHERE created_at < ? AND model_id != ?",
+                (cutoff, keep or ""),
+            ).fetchall()
+            self._remove(evicted)
+        if self.max_models > 0 or self.max_bytes > 0:
+            # Walk from newest to oldest; everything past a limit goes.
+            rows = connection.execute(
+                "SELECT model_id, file_name, size_bytes FROM models ORDER BY model_id = ? DESC, created_at DESC",
+                (keep or "",),
+            ).fetchall()
+            kept, kept_bytes, over = 0, 0, []
+            for row in rows:
+                kept += 1
+                kept_bytes += row["size_bytes"]
+                if row["model_id"] != keep and (
+                    (self.max_models > 0 and kept > self.max_models)
+                    or (self.max_bytes > 0 and kept_bytes > self.max_bytes)
+                ):
+                    over.append(row)
+                    kept -= 1
+                    kept_bytes -= row["size_bytes"]
+            self._remove(over)
+            evicted += over
+        return [row["model_id"] for row in evicted]
+
+    def _remove(self, rows) -> None:
+        if not rows:
+            return
+        connection = self._db()
+        connection.executemany("DELETE FROM models WHERE model_id = ?", [(row[0],) for row in rows])
+        connection.commit()
+        for row in rows:
+            (self.models_dir / row[1]).unlink(missing_ok=True)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(models)")}
+            for column, definition in _ADDED_COLUMNS:
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE models ADD COLUMN {column} {definition}")
+            connection.commit()
+            self._connection = connection
+            self._adopt_unregistered_files()
+        return self._connection
+
+    def _adopt_unregistered_files(self) -> None:
+        # Models exported before the registry existed are indexed once from
+        # their file names, so their download links keep working.
+        if not self.models_dir.exists():
+            return
+        known = {row[0] for row in self._connection.execute("SELECT model_id FROM models")}
+        rows = []
+        for path in self.models_dir.glob("*.joblib"):
+            match = _LEGACY_FILE_PATTERN.match(path.name)
+            if match is None or match.group(1) in known:
+                continue
+            stat = path.stat()
+            rows.append((match.group(1), path.name, match.group(2), stat.st_size, stat.st_mtime))
+        if rows:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO models (model_id, file_name, model_type, size_bytes, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._connection.commit()
+
+
+def _record(row: sqlite3.Row) -> Dict[str, Any]:
+    record = dict(row)
+    for key in ("params", "search_configuration", "feature_names", "target_classes"):
+        record[key] = json.loads(record[key]) if record[key] is not None else None
+    record["created_at"] = datetime.fromtimestamp(record["created_at"], timezone.utc).isoformat()
+    record["download_url"] = f"/optimize/download-model/{record['model_id']}"
+    record["predict_url"] = f"/predict/{record['model_id']}"
+    return record
+
+
+model_registry = ModelRegistry()
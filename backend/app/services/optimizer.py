@@ -1,13 +1,10 @@
-import os
+import time
 import uuid
-from datetime import datetime, timezone
+from functools import partial
 from math import isinf
-from pathlib import Path
 from typing import Any, Dict, Tuple
 
-import joblib
 import numpy as np
-import pandas as pd
 from sklearn.metrics import (
     accuracy_score,
     classification_report,
@@ -20,14 +17,23 @@ from sklearn.metrics import (
     roc_auc_score,
     roc_curve,
 )
-from sklearn.model_selection import train_test_split
-from sklearn.utils.multiclass import type_of_target
 
-from .dataset_handler import DATA_PATH
-from .genetic_algorithm import run_ga
+from .artifacts import MODEL_ARTIFACT_COMPRESSION, artifact_file_name, artifact_writer, compression_error
+from .checkpoints import CheckpointWriter, load_best_model, load_checkpoint, top_candidates
+from .dataset_handler import resolve_dataset_path
+from .dataset_registry import dataset_registry
+from .evaluation import EVALUATION_BACKENDS
+from .fitness_cache import fitness_cache
+from .genetic_algorithm import budget_rungs, run_ga
+from .instrumentation import RunTimings, metrics
+from .model_registry import MODEL_STORAGE_DIR, model_registry
+from .preprocessing import bundle_model
+from .islands import ISLAND_TRANSPORTS, run_islands
+from .steady_state import run_steady_state
 
 
-MODEL_STORAGE_DIR = Path("app/storage/models")
+VALIDATION_SPLIT = 0.2
+VALIDATION_SPLIT_SEED = 42
 
 
 def _round_numeric(value: Any, precision: int = 4) -> Any:
@@ -45,6 +51,26 @@ def _sanitize_params(params: Dict[str, Any]) -> Dict[str, Any]:
     return sanitized
 
 
+def format_generation_detail(record: Dict[str, Any]) -> Dict[str, Any]:
+    formatted = dict(record)
+    for key in ("best_score", "average_score", "median_score", "std_dev", "diversity", "wall_seconds"):
+        formatted[key] = _round_numeric(record.get(key)) if record.get(key) is not None else None
+    formatted["top_candidates"] = [
+        {
+            **candidate,
+            "score": _round_numeric(candidate.get("score")) if candidate.get("score") is not None else None,
+            "params": _sanitize_params(candidate.get("params", {})),
+        }
+        for candidate in record.get("top_candidates", [])
+    ]
+    return formatted
+
+
+def _json_thresholds(thresholds) -> list:
+    # roc_curve starts with an infinite threshold, which JSON cannot carry.
+    return [float(value) if np.isfinite(value) else None for value in thresholds]
+
+
 def _classification_metrics(model, X_val, y_val) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     y_pred = model.predict(X_val)
     metrics: Dict[str, Any] = {
@@ -89,7 +115,7 @@ def _classification_metrics(model, X_val, y_val) -> Tuple[Dict[str, Any], Dict[s
             roc_info = {
                 "fpr": fpr.tolist(),
                 "tpr": tpr.tolist(),
-                "thresholds": thresholds.tolist(),
+                "thresholds": _json_thresholds(thresholds),
                 "auc": _round_numeric(roc_auc_score(y_val, probability_matrix[:, 1])),
             }
     elif hasattr(model, "decision_function"):
@@ -99,7 +125,7 @@ def _classification_metrics(model, X_val, y_val) -> Tuple[Dict[str, Any], Dict[s
             roc_info = {
                 "fpr": fpr.tolist(),
                 "tpr": tpr.tolist(),
-                "thresholds": thresholds.tolist(),
+                "thresholds": _json_thresholds(thresholds),
                 "auc": _round_numeric(roc_auc_score(y_val, decision_scores)),
             }
         probability_matrix = decision_scores
@@ -192,50 +218,215 @@ def _extract_feature_insights(model, feature_names):
     return None
 
 
-async def run_optimization(req):
-    if not os.path.exists(DATA_PATH):
+def _load_compatible_checkpoint(checkpoint_id, dataset, req):
+    checkpoint = load_checkpoint(checkpoint_id)
+    if checkpoint is None:
+        return None, f"Checkpoint '{checkpoint_id}' not found."
+    if checkpoint["dataset_fingerprint"] != dataset.fingerprint:
+        return None, f"Checkpoint '{checkpoint_id}' belongs to a different dataset or target column."
+    if checkpoint["request"]["model_type"] != req.model_type:
+        return None, f"Checkpoint '{checkpoint_id}' was created for model type '{checkpoint['request']['model_type']}'."
+    return checkpoint, None
+
+
+def _cache_scheme(req) -> str:
+    scheme = f"cv{req.cv_folds}" if req.cv_folds else "holdout"
+    # A chromosome that hit a limit scores the penalty, so scores are only
+    # shared between runs with the same limits.
+    if req.evaluation_timeout_seconds is not None or req.evaluation_memory_limit_mb is not None:
+        scheme += f":limits{req.evaluation_timeout_seconds}s{req.evaluation_memory_limit_mb}mb"
+    return scheme
+
+
+def run_optimization(req, progress_callback=None, cancel_event=None, checkpoint_id=None, resume_from=None):
+    if req.evaluation_backend not in EVALUATION_BACKENDS:
+        return {"error": f"Unsupported evaluation backend '{req.evaluation_backend}'."}
+
+    limits = (req.evaluation_timeout_seconds, req.evaluation_memory_limit_mb)
+    if any(limit is not None for limit in limits):
+        if req.evaluation_backend != "isolated":
+            return {"error": "Evaluation time and memory limits require the 'isolated' evaluation backend."}
+        if any(limit is not None and limit <= 0 for limit in limits):
+            return {"error": "evaluation_timeout_seconds and evaluation_memory_limit_mb must be positive."}
+
+    if req.seed < 0:
+        return {"error": "seed must be a non-negative integer."}
+
+    artifact_compression = req.artifact_compression or MODEL_ARTIFACT_COMPRESSION
+    error = compression_error(artifact_compression, req.artifact_compression_level)
+    if error is not None:
+        return {"error": error}
+
+    if not 0 <= req.elitism < req.population_size:
+        return {"error": "elitism must be at least 0 and smaller than population_size."}
+
+    if req.steady_state and (
+        req.islands > 1 or req.cv_folds or req.multi_fidelity or req.surrogate or resume_from is not None
+    ):
+        return {"error": "steady_state cannot be combined with islands, cv_folds, multi_fidelity, surrogate or resume."}
+
+    if req.islands > 1:
+        if req.island_transport not in ISLAND_TRANSPORTS:
+            return {"error": f"Unsupported island transport '{req.island_transport}'."}
+        if req.migration_interval < 1 or not 0 <= req.migration_size <= req.population_size - req.elitism:
+            return {"error": "migration_interval must be positive and migration_size fit beside the elites."}
+        if resume_from is not None:
+            return {"error": "Island runs cannot be resumed from a checkpoint."}
+
+    if req.surrogate and req.surrogate_pool_factor < 1:
+        return {"error": "surrogate_pool_factor must be at least 1."}
+
+    if req.cv_folds is not None and req.cv_folds < 2:
+        return {"error": "cv_folds must be at least 2."}
+
+    if req.cv_folds and req.multi_fidelity:
+        return {"error": "Cross-validated fitness cannot be combined with multi_fidelity."}
+
+    if req.multi_fidelity and not (0.0 < req.fidelity_min_budget < 1.0 and req.fidelity_eta >= 2):
+        return {"error": "fidelity_min_budget must be between 0 and 1 and fidelity_eta at least 2."}
+
+    data_path = resolve_dataset_path(req.dataset_id)
+    if data_path is None:
+        if req.dataset_id is not None:
+            return {"error": f"Dataset '{req.dataset_id}' not found."}
         return {"error": "Dataset not uploaded yet."}
 
-    df = pd.read_csv(DATA_PATH)
-
-    if req.target_column not in df.columns:
+    timings = RunTimings()
+    dataset = dataset_registry.prepare(data_path, req.target_column, timings=timings)
+    if dataset is None:
         return {"error": f"Target column '{req.target_column}' not found in dataset."}
 
-    X = df.drop(columns=[req.target_column])
-    y = df[req.target_column]
-
-    X = pd.get_dummies(X)
-    is_categorical_target = y.dtype == "object"
-    if is_categorical_target:
-        y = pd.factorize(y)[0]
-
-    target_type = type_of_target(y)
-    is_classification = target_type in ["binary", "multiclass"]
-    stratify_labels = y if is_classification else None
-
-    X_train, X_val, y_train, y_val = train_test_split(
-        X,
-        y,
-        test_size=0.2,
-        random_state=42,
-        stratify=stratify_labels if is_classification else None,
-    )
+    is_classification = dataset.is_classification
+    with timings.phase("split"):
+        X_train, X_val, y_train, y_val = dataset.split(VALIDATION_SPLIT, VALIDATION_SPLIT_SEED)
+
+    resume_state = None
+    if resume_from is not None:
+        checkpoint, error = _load_compatible_checkpoint(resume_from, dataset, req)
+        if checkpoint is None:
+            return {"error": error}
+        resume_state = {**checkpoint, "best_model": load_best_model(checkpoint)}
+
+    initial_genes = None
+    if req.seed_from is not None and resume_state is None:
+        checkpoint, error = _load_compatible_checkpoint(req.seed_from, dataset, req)
+        if checkpoint is None:
+            return {"error": error}
+        # Seed half the population so the rest still explores.
+        initial_genes = top_candidates(checkpoint, max(1, req.population_size // 2))
+
+    checkpoint_writer = None
+    if checkpoint_id is not None and req.islands <= 1 and not req.steady_state:
+        checkpoint_writer = CheckpointWriter(
+            checkpoint_id,
+            {**req.model_dump(), "dataset_id": dataset.content_hash},
+            dataset.fingerprint,
+            dataset.content_hash,
+        )
+        if resume_state is not None:
+            checkpoint_writer.seed_from(resume_state)
+
+    cache_session = None
+    if req.use_fitness_cache:
+        cache_session = fitness_cache.session(
+            dataset.fingerprint,
+            VALIDATION_SPLIT_SEED,
+            req.model_type,
+            use_disk=req.persist_fitness_cache,
+            scheme=_cache_scheme(req),
+            run_seed=req.seed,
+        )
 
-    run_ga_result = run_ga(
-        X_train,
-        y_train,
-        X_val,
-        y_val,
+    search_options = dict(
         generations=req.generations,
         population_size=req.population_size,
         model_type=req.model_type,
-        return_model=True,
+        evaluation_backend=req.evaluation_backend,
+        n_workers=req.n_workers,
+        multi_fidelity=req.multi_fidelity,
+        fidelity_min_budget=req.fidelity_min_budget,
+        fidelity_eta=req.fidelity_eta,
+        patience=req.patience,
+        min_delta=req.min_delta,
+        min_diversity=req.min_diversity,
+        time_budget_seconds=req.time_budget_seconds,
+        max_evaluations=req.max_evaluations,
+        elitism=req.elitism,
+        cv_folds=req.cv_folds,
+        cv_early_abandon=req.cv_early_abandon,
+        initial_genes=initial_genes,
+        surrogate=req.surrogate,
+        surrogate_pool_factor=req.surrogate_pool_factor,
+        surrogate_exploration=req.surrogate_exploration,
+        evaluation_timeout_seconds=req.evaluation_timeout_seconds,
+        evaluation_memory_limit_mb=req.evaluation_memory_limit_mb,
     )
 
+    search_started = time.perf_counter()
+    if req.steady_state:
+        run_ga_result = run_steady_state(
+            X_train,
+            y_train,
+            X_val,
+            y_val,
+            generations=req.generations,
+            population_size=req.population_size,
+            model_type=req.model_type,
+            return_model=True,
+            evaluation_backend=req.evaluation_backend,
+            n_workers=req.n_workers,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            fitness_cache=cache_session,
+            patience=req.patience,
+            min_delta=req.min_delta,
+            min_diversity=req.min_diversity,
+            time_budget_seconds=req.time_budget_seconds,
+            max_evaluations=req.max_evaluations,
+            initial_genes=initial_genes,
+            seed=req.seed,
+            evaluation_timeout_seconds=req.evaluation_timeout_seconds,
+            evaluation_memory_limit_mb=req.evaluation_memory_limit_mb,
+        )
+    elif req.islands > 1:
+        # Islands run in their own processes, so the in-memory fitness cache
+        # and per-generation checkpoints stay with single-population runs.
+        run_ga_result = run_islands(
+            X_train,
+            y_train,
+            X_val,
+            y_val,
+            n_islands=req.islands,
+            migration_interval=req.migration_interval,
+            migration_size=req.migration_size,
+            transport=req.island_transport,
+            seed=req.seed,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            **search_options,
+        )
+    else:
+        run_ga_result = run_ga(
+            X_train,
+            y_train,
+            X_val,
+            y_val,
+            return_model=True,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            fitness_cache=cache_session,
+            resume_state=resume_state,
+            checkpoint_callback=checkpoint_writer,
+            seed=req.seed,
+            **search_options,
+        )
+
+    timings.add("search", time.perf_counter() - search_started)
+
     if run_ga_result is None:
         return {"error": "Optimization failed to produce a valid model."}
 
-    best_params, best_score, generation_scores, best_model, generation_details = run_ga_result
+    best_params, best_score, generation_scores, best_model, generation_details, run_summary = run_ga_result
 
     if best_model is None:
         return {"error": "No valid model produced during optimization."}
@@ -247,16 +438,11 @@ async def run_optimization(req):
     generation_scores = [sanitize_score(score) for score in generation_scores]
 
     if generation_details:
-        for record in generation_details:
-            record["best_score"] = _round_numeric(record.get("best_score")) if record.get("best_score") is not None else None
-            record["average_score"] = _round_numeric(record.get("average_score")) if record.get("average_score") is not None else None
-            record["median_score"] = _round_numeric(record.get("median_score")) if record.get("median_score") is not None else None
-            record["std_dev"] = _round_numeric(record.get("std_dev")) if record.get("std_dev") is not None else None
-            for candidate in record.get("top_candidates", []):
-                candidate["score"] = _round_numeric(candidate.get("score")) if candidate.get("score") is not None else None
-                candidate["params"] = _sanitize_params(candidate.get("params", {}))
-
-    feature_names = X.columns.tolist()
+        generation_details = [format_generation_detail(record) for record in generation_details]
+
+    run_summary["elapsed_seconds"] = _round_numeric(run_summary["elapsed_seconds"])
+
+    feature_names = dataset.feature_names
     feature_insights = _extract_feature_insights(best_model, feature_names)
 
     if best_params is None:
@@ -264,22 +450,89 @@ async def run_optimization(req):
     else:
         formatted_params = _sanitize_params(best_params)
 
-    if is_classification:
-        evaluation, prediction_payload = _classification_metrics(best_model, X_val, y_val)
-    else:
-        evaluation, prediction_payload = _regression_metrics(best_model, X_val, y_val)
+    with timings.phase("metrics"):
+        if is_classification:
+            evaluation, prediction_payload = _classification_metrics(best_model, X_val, y_val)
+        else:
+            evaluation, prediction_payload = _regression_metrics(best_model, X_val, y_val)
+
+    search_configuration = {
+        "generations": req.generations,
+        "population_size": req.population_size,
+        "seed": req.seed,
+        "elitism": req.elitism,
+        "cv_folds": req.cv_folds,
+        "surrogate": req.surrogate,
+        "steady_state": req.steady_state,
+        "islands": req.islands,
+        "migration_interval": req.migration_interval if req.islands > 1 else None,
+        "migration_size": req.migration_size if req.islands > 1 else None,
+        "island_transport": req.island_transport if req.islands > 1 else None,
+        "validation_split": VALIDATION_SPLIT,
+        "evaluation_backend": req.evaluation_backend,
+        "n_workers": req.n_workers,
+        "evaluation_timeout_seconds": req.evaluation_timeout_seconds,
+        "evaluation_memory_limit_mb": req.evaluation_memory_limit_mb,
+        "multi_fidelity": req.multi_fidelity,
+        "fidelity_rungs": budget_rungs(req.fidelity_min_budget, req.fidelity_eta) if req.multi_fidelity else None,
+        "patience": req.patience,
+        "min_delta": req.min_delta,
+        "min_diversity": req.min_diversity,
+        "time_budget_seconds": req.time_budget_seconds,
+        "max_evaluations": req.max_evaluations,
+    }
 
-    MODEL_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+    # The artifact is written and registered in the background, so the
+    # response does not wait on dumping a large model. It bundles the
+    # dataset's fitted encoder, so it scores raw rows directly.
     model_id = uuid.uuid4().hex
-    model_file_name = f"{model_id}_{req.model_type}.joblib"
-    model_path = MODEL_STORAGE_DIR / model_file_name
-    joblib.dump(best_model, model_path)
+    model_file_name = artifact_file_name(model_id, req.model_type, artifact_compression)
+    artifact_writer.submit(
+        model_id,
+        bundle_model(dataset.encoder, best_model),
+        MODEL_STORAGE_DIR / model_file_name,
+        artifact_compression,
+        req.artifact_compression_level,
+        on_written=partial(
+            model_registry.register,
+            model_id,
+            model_file_name,
+            req.model_type,
+            task_type="classification" if is_classification else "regression",
+            dataset_id=dataset.content_hash,
+            target_column=req.target_column,
+            score=_round_numeric(best_score),
+            params=formatted_params if best_params is not None else None,
+            search_configuration=search_configuration,
+            job_id=checkpoint_id,
+            compression=artifact_compression,
+            feature_names=feature_names,
+            target_classes=dataset.target_classes,
+        ),
+    )
     model_asset = {
         "id": model_id,
         "file_name": model_file_name,
         "model_type": req.model_type,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "compression": artifact_compression,
         "download_url": f"/optimize/download-model/{model_id}",
+        "predict_url": f"/predict/{model_id}",
+    }
+
+    # Search-level phases (fit, predict, selection, ...) come from the search
+    # itself; the ones around it were measured here.
+    timings.merge(run_summary.pop("timings", {}))
+    run_timings = timings.as_dict()
+    metrics.observe_run(run_timings)
+    metrics.increment(
+        "fitness_evaluations_total",
+        run_summary["evaluations"],
+        help_text="Fitness evaluations run by completed optimizations.",
+        model_type=req.model_type,
+    )
+    run_summary["timings"] = {
+        phase: {"seconds": _round_numeric(entry["seconds"]), "count": entry["count"]}
+        for phase, entry in run_timings.items()
     }
 
     return {
@@ -292,14 +545,17 @@ async def run_optimization(req):
         "feature_insights": feature_insights,
         "task_type": "classification" if is_classification else "regression",
         "model_type": req.model_type,
-        "search_configuration": {
-            "generations": req.generations,
-            "population_size": req.population_size,
-            "validation_split": 0.2,
-        },
+        "search_configuration": search_configuration,
+        "stop_reason": run_summary["stop_reason"],
+        "run_summary": run_summary,
         "dataset_metadata": {
+            "dataset_id": dataset.content_hash,
             "feature_count": len(feature_names),
-            "row_count": int(df.shape[0]),
+            "row_count": dataset.row_count,
         },
         "model_asset": model_asset,
+        "checkpoint_id": checkpoint_id if checkpoint_writer is not None else None,
+        "resumed_from": resume_from,
+        "seeded_from": req.seed_from if initial_genes is not None else None,
+        "fitness_cache": cache_session.stats() if cache_session is not None else {"enabled": False},
     }
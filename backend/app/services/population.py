@@ -0,0 +1,137 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .instrumentation import RunTimings, timed
+
+
+class GeneSchema:
+    """Maps chromosomes onto rows of a float array.
+
+    Each hyperparameter range becomes one column with its bounds; integer
+    genes are stored as whole floats so the population is a single
+    ``(size, width)`` array that the operators below work on in bulk.
+    """
+
+    def __init__(self, ranges: Dict[str, Tuple[Any, Any]]):
+        self.names = list(ranges)
+        self.lower = np.array([bounds[0] for bounds in ranges.values()], dtype=float)
+        self.upper = np.array([bounds[1] for bounds in ranges.values()], dtype=float)
+        self.is_int = np.array([not isinstance(bounds[0], float) for bounds in ranges.values()])
+
+    @property
+    def width(self) -> int:
+        return len(self.names)
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        genes = rng.uniform(self.lower, self.upper, size=(size, self.width))
+        # Integer bounds are inclusive, as with random.randint.
+        ints = rng.integers(self.lower, self.upper + 1, size=(size, self.width))
+        return np.where(self.is_int, ints, genes)
+
+    def decode(self, row: np.ndarray) -> Dict[str, Any]:
+        return {
+            name: int(value) if is_int else float(value)
+            for name, value, is_int in zip(self.names, row.tolist(), self.is_int.tolist())
+        }
+
+    def decode_all(self, genes: np.ndarray) -> List[Dict[str, Any]]:
+        return [self.decode(row) for row in genes]
+
+    def encode(self, chromosome: Dict[str, Any]) -> np.ndarray:
+        return np.array([chromosome[name] for name in self.names], dtype=float)
+
+
+def fitness_ranks(fidelities, scores) -> np.ndarray:
+    # Rank by fidelity first, then score, so individuals promoted to a higher
+    # rung always beat those screened out earlier. Higher rank is better.
+    order = np.lexsort((np.asarray(scores, dtype=float), np.asarray(fidelities, dtype=float)))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    return ranks
+
+
+def tournament_select(ranks: np.ndarray, count: int, rng: np.random.Generator, tournament_size: int = 3) -> np.ndarray:
+    size = min(tournament_size, len(ranks))
+    # Each row draws `size` distinct contestants; the best-ranked one wins.
+    contestants = np.argsort(rng.random((count, len(ranks))), axis=1)[:, :size]
+    winners = np.argmax(ranks[contestants], axis=1)
+    return contestants[np.arange(count), winners]
+
+
+def crossover(parents: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    # Single-point crossover on consecutive pairs of rows.
+    first, second = parents[0::2], parents[1::2]
+    width = parents.shape[1]
+    if width < 2:
+        return parents.copy()
+    points = rng.integers(1, width, size=len(first))
+    head = np.arange(width) < points[:, None]
+    children = np.empty_like(parents)
+    children[0::2] = np.where(head, first, second)
+    children[1::2] = np.where(head, second, first)
+    return children
+
+
+def mutate(genes: np.ndarray, schema: GeneSchema, rng: np.random.Generator, mutation_rate: float = 0.1) -> np.ndarray:
+    # A mutated gene is redrawn uniformly from its range.
+    mask = rng.random(genes.shape) < mutation_rate
+    return np.where(mask, schema.sample(len(genes), rng), genes)
+
+
+def next_generation(
+    genes: np.ndarray,
+    ranks: np.ndarray,
+    schema: GeneSchema,
+    rng: np.random.Generator,
+    elitism: int = 1,
+    mutation_rate: float = 0.1,
+    screen: Optional[Callable[[np.ndarray, int], np.ndarray]] = None,
+    pool_factor: int = 1,
+    timings: Optional[RunTimings] = None,
+) -> np.ndarray:
+    size = len(genes)
+    elite_count = min(max(elitism, 0), size)
+    elites = genes[np.argsort(ranks)[::-1][:elite_count]]
+
+    offspring_count = size - elite_count
+    if offspring_count == 0:
+        return elites
+    # With a screen, breed pool_factor times more children than there are
+    # slots and let the screen pick which ones are worth training.
+    pool_size = offspring_count * (pool_factor if screen is not None else 1)
+    # Parents are drawn in pairs, so round up and trim the spare child.
+    with timed(timings, "selection"):
+        parents = genes[tournament_select(ranks, pool_size + pool_size % 2, rng)]
+    with timed(timings, "crossover"):
+        children = crossover(parents, rng)
+    with timed(timings, "mutation"):
+        children = mutate(children, schema, rng, mutation_rate)[:pool_size]
+    if screen is not None:
+        with timed(timings, "surrogate_screen"):
+            children = screen(children, offspring_count)
+    return np.vstack([elites, children])
+
+
+def population_diversity(genes: np.ndarray) -> float:
+    # Share of distinct chromosomes; 1/len(genes) means full collapse.
+    if len(genes) == 0:
+        return 0.0
+    return len(np.unique(genes, axis=0)) / len(genes)
+
+
+def breed_one(
+    genes: np.ndarray,
+    ranks: np.ndarray,
+    schema: GeneSchema,
+    rng: np.random.Generator,
+    mutation_rate: float = 0.1,
+    timings: Optional[RunTimings] = None,
+) -> np.ndarray:
+    # Steady-state breeding: one tournament pair, one child.
+    with timed(timings, "selection"):
+        parents = genes[tournament_select(ranks, 2, rng)]
+    with timed(timings, "crossover"):
+        child = crossover(parents, rng)[:1]
+    with timed(timings, "mutation"):
+        return mutate(child, schema, rng, mutation_rate)[0]
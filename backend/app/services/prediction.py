@@ -0,0 +1,331 @@
+import asyncio
+import importlib.util
+import io
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+from sklearn.pipeline import Pipeline
+
+from .artifacts import load_artifact
+from .instrumentation import metrics
+from .model_registry import model_registry
+from .preprocessing import encode_features
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_CACHE_MAX_BYTES = int(os.environ.get("PREDICTION_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Requests arriving within this window are scored together.
+PREDICTION_BATCH_WINDOW_MS = float(os.environ.get("PREDICTION_BATCH_WINDOW_MS", "2"))
+PREDICTION_MAX_BATCH_ROWS = int(os.environ.get("PREDICTION_MAX_BATCH_ROWS", "4096"))
+
+JSON_CONTENT_TYPES = ("application/json",)
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+ARROW_CONTENT_TYPES = (
+    "application/vnd.apache.arrow.stream",
+    "application/vnd.apache.arrow.file",
+    "application/x-arrow",
+)
+
+
+class PredictionInputError(ValueError):
+    pass
+
+
+def read_batch(body: bytes, content_type: str) -> pd.DataFrame:
+    """Parse a JSON, CSV or Arrow request body into a frame of raw feature rows.
+
+    JSON bodies are a list of records, or an object with the list under
+    "rows". Arrow bodies may be an IPC stream or file and need pyarrow.
+    """
+    media_type = (content_type or "application/json").split(";")[0].strip().lower()
+    try:
+        if media_type in JSON_CONTENT_TYPES:
+            payload = json.loads(body) if body else None
+            rows = payload.get("rows") if isinstance(payload, dict) else payload
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                raise PredictionInputError('JSON bodies must be a list of records or {"rows": [...]}.')
+            return pd.DataFrame.from_records(rows)
+        if media_type in CSV_CONTENT_TYPES:
+            return pd.read_csv(io.BytesIO(body))
+        if media_type in ARROW_CONTENT_TYPES:
+            if importlib.util.find_spec("pyarrow") is None:
+                raise PredictionInputError("Arrow batches need the 'pyarrow' package, which is not installed.")
+            import pyarrow as pa
+
+            reader = pa.ipc.open_file if media_type.endswith(".file") else pa.ipc.open_stream
+            return reader(pa.BufferReader(body)).read_all().to_pandas()
+    except PredictionInputError:
+        raise
+    except Exception as exc:
+        raise PredictionInputError(f"Could not parse the {media_type} body: {exc}") from exc
+    raise PredictionInputError(
+        f"Unsupported content type '{media_type}'. Send JSON, CSV or Arrow ({', '.join(ARROW_CONTENT_TYPES)})."
+    )
+
+
+def align_features(frame: pd.DataFrame, feature_names: List[str], target_column: Optional[str]) -> np.ndarray:
+    """One-hot encode a batch with `pd.get_dummies` and line its columns up
+    with the model's, for models exported without their encoder. Categories
+    unseen in training are dropped and missing ones become zeros."""
+    if target_column is not None and target_column in frame.columns:
+        frame = frame.drop(columns=[target_column])
+    encoded = pd.get_dummies(frame)
+    present = set(encoded.columns)
+    missing = [
+        name
+        for name in feature_names
+        if name not in present and not any(name.startswith(f"{column}_") for column in frame.columns)
+    ]
+    if missing:
+        raise PredictionInputError(f"Missing feature columns: {', '.join(map(str, missing[:10]))}.")
+    return encoded.reindex(columns=feature_names, fill_value=0).to_numpy(dtype=np.float32)
+
+
+class _ByteCounter:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data) -> int:
+        # Large buffers arrive as PickleBuffer objects, which have no len().
+        size = memoryview(data).nbytes
+        self.size += size
+        return size
+
+
+def _model_bytes(model: Any) -> int:
+    # Pickled size tracks the arrays a model holds; nothing is buffered.
+    counter = _ByteCounter()
+    pickle.dump(model, counter, protocol=pickle.HIGHEST_PROTOCOL)
+    return counter.size
+
+
+class LoadedModel:
+    def __init__(self, record: Dict[str, Any], artifact: Any):
+        self.model_id = record["model_id"]
+        # Artifacts bundle the fitted encoder with the estimator; older ones
+        # are the bare estimator.
+        if isinstance(artifact, Pipeline) and "preprocess" in artifact.named_steps:
+            self.encoder = artifact.named_steps["preprocess"]
+            self.model = artifact[-1]
+        else:
+            self.encoder = None
+            self.model = artifact
+        self.feature_names: List[str] = record["feature_names"]
+        self.target_classes: Optional[List[str]] = record["target_classes"]
+        self.target_column: Optional[str] = record["target_column"]
+        self.task_type: Optional[str] = record["task_type"]
+
+    def encode(self, frame: pd.DataFrame):
+        if self.encoder is None:
+            return align_features(frame, self.feature_names, self.target_column)
+        missing = [column for column in self.encoder.feature_names_in_ if column not in frame.columns]
+        if missing:
+            raise PredictionInputError(f"Missing feature columns: {', '.join(map(str, missing[:10]))}.")
+        try:
+            return encode_features(self.encoder, frame)
+        except (ValueError, TypeError) as exc:
+            raise PredictionInputError(self._encoding_error(frame, exc)) from exc
+
+    def _encoding_error(self, frame: pd.DataFrame, exc: Exception) -> str:
+        # Categorical columns accept any value; only passed-through columns
+        # must convert to numbers.
+        for name, _, columns in self.encoder.transformers_:
+            if name != "passthrough":
+                continue
+            for column in columns:
+                try:
+                    frame[column].to_numpy(dtype=np.float32)
+                except (ValueError, TypeError):
+                    return f"Column '{column}' must be numeric."
+        return f"Could not encode the batch: {exc}"
+
+    @property
+    def has_probabilities(self) -> bool:
+        return self.task_type == "classification" and hasattr(self.model, "predict_proba")
+
+    def predict(self, X: np.ndarray, probabilities: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        predictions = self.model.predict(X)
+        proba = self.model.predict_proba(X) if probabilities else None
+        return predictions, proba
+
+    def labels(self, predictions: np.ndarray) -> List[Any]:
+        if self.target_classes is not None:
+            return [self.target_classes[int(code)] for code in predictions]
+        return predictions.tolist()
+
+    def classes(self) -> Optional[List[Any]]:
+        if not self.has_probabilities:
+            return None
+        return self.labels(np.asarray(self.model.classes_))
+
+
+def _count_lookup(result: str) -> None:
+    metrics.increment("prediction_model_cache_total", help_text="Prediction model cache lookups.", result=result)
+
+
+class ModelCache:
+    """Deserialized models kept in memory, least recently used first out.
+
+    The cache is bounded by the models' estimated in-memory size rather than
+    a count, since one deep forest can outweigh dozens of small networks.
+    Concurrent requests for a model that is not loaded yet share one load.
+    """
+
+    def __init__(self, max_bytes: int = PREDICTION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[LoadedModel, int]]" = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, record: Dict[str, Any]) -> LoadedModel:
+        model_id = record["model_id"]
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is not None:
+                self._entries.move_to_end(model_id)
+                _count_lookup("hit")
+                return entry[0]
+            loading = self._loading.get(model_id)
+            owner = loading is None
+            if owner:
+                loading = self._loading[model_id] = Future()
+        if not owner:
+            return loading.result()
+
+        _count_lookup("miss")
+        try:
+            loaded = LoadedModel(record, load_artifact(model_registry.path(record), record["compression"]))
+            size = _model_bytes((loaded.encoder, loaded.model))
+        except Exception as exc:
+            with self._lock:
+                self._loading.pop(model_id, None)
+            loading.set_exception(exc)
+            raise
+        self._put(model_id, loaded, size)
+        loading.set_result(loaded)
+        return loaded
+
+    def discard(self, model_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(model_id, None)
+            if entry is not None:
+                self._total_bytes -= entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"models": len(self._entries), "bytes": self._total_bytes, "max_bytes": self.max_bytes}
+
+    def _put(self, model_id: str, loaded: LoadedModel, size: int) -> None:
+        with self._lock:
+            self._loading.pop(model_id, None)
+            if size > self.max_bytes:
+                logger.warning("Model %s (%d bytes) exceeds the prediction cache; it is not cached", model_id, size)
+                return
+            self._entries[model_id] = (loaded, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+
+class PredictionBatcher:
+    """Coalesces small concurrent requests for a model into one `predict` call.
+
+    The first request for a model opens a batch and waits `window_seconds`
+    for more rows; the batch is scored in a worker thread once the window
+    closes or `max_rows` is reached, and every request gets its own slice
+    of the result. Requests with `max_rows` rows or more skip the queue.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = PREDICTION_BATCH_WINDOW_MS / 1000,
+        max_rows: int = PREDICTION_MAX_BATCH_ROWS,
+    ):
+        self.window_seconds = window_seconds
+        self.max_rows = max_rows
+        self._batches: Dict[Tuple[str, bool], List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        self._rows: Dict[Tuple[str, bool], int] = {}
+
+    async def predict(self, loaded: LoadedModel, X: np.ndarray, probabilities: bool = False):
+        loop = asyncio.get_running_loop()
+        if self.window_seconds <= 0 or X.shape[0] >= self.max_rows:
+            return await loop.run_in_executor(None, loaded.predict, X, probabilities)
+
+        key = (loaded.model_id, probabilities)
+        future = loop.create_future()
+        batch = self._batches.setdefault(key, [])
+        batch.append((X, future))
+        self._rows[key] = self._rows.get(key, 0) + X.shape[0]
+        if len(batch) == 1:
+            loop.call_later(self.window_seconds, self._flush, key, loaded, batch)
+        if self._rows[key] >= self.max_rows:
+            self._flush(key, loaded, batch)
+        return await future
+
+    def _flush(self, key, loaded: LoadedModel, batch) -> None:
+        # A full batch is flushed early; its timer then finds nothing to do.
+        if self._batches.get(key) is not batch:
+            return
+        del self._batches[key]
+        del self._rows[key]
+        asyncio.ensure_future(self._score(loaded, key[1], batch))
+
+    async def _score(self, loaded: LoadedModel, probabilities: bool, batch) -> None:
+        loop = asyncio.get_running_loop()
+        if len(batch) == 1:
+            X = batch[0][0]
+        elif sp.issparse(batch[0][0]):
+            X = sp.vstack([rows for rows, _ in batch], format="csr")
+        else:
+            X = np.concatenate([rows for rows, _ in batch])
+        try:
+            predictions, proba = await loop.run_in_executor(None, loaded.predict, X, probabilities)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        metrics.increment("prediction_batches_total", help_text="Model predict calls made by the batcher.")
+        start = 0
+        for rows, future in batch:
+            stop = start + rows.shape[0]
+            if not future.done():
+                future.set_result((predictions[start:stop], proba[start:stop] if proba is not None else None))
+            start = stop
+
+
+async def predict_batch(record: Dict[str, Any], body: bytes, content_type: str, probabilities: bool = False):
+    loop = asyncio.get_running_loop()
+    # Parsing and encoding a large batch would stall every other request, so
+    # both run in the executor like predict.
+    frame = await loop.run_in_executor(None, read_batch, body, content_type)
+    if frame.empty:
+        raise PredictionInputError("The batch has no rows.")
+    loaded = await loop.run_in_executor(None, model_cache.get, record)
+    if probabilities and not loaded.has_probabilities:
+        raise PredictionInputError("This model does not produce class probabilities.")
+    X = await loop.run_in_executor(None, loaded.encode, frame)
+    predictions, proba = await prediction_batcher.predict(loaded, X, probabilities)
+    rows = X.shape[0]
+    metrics.increment("predicted_rows_total", rows, help_text="Rows scored by the prediction endpoint.")
+
+    result = {"model_id": loaded.model_id, "rows": rows, "predictions": loaded.labels(predictions)}
+    if proba is not None:
+        result["classes"] = loaded.classes()
+        result["probabilities"] = np.round(proba.astype(np.float64), 6).tolist()
+    return result
+
+
+model_cache = ModelCache()
+prediction_batcher = PredictionBatcher()
@@ -0,0 +1,68 @@
+import os
+from typing import Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+# Datasets whose one-hot encoding adds at least this many columns are kept as
+# sparse CSR matrices.
+SPARSE_ONE_HOT_MIN_COLUMNS = int(os.environ.get("SPARSE_ONE_HOT_MIN_COLUMNS", "256"))
+
+# The dtypes pd.get_dummies encodes by default.
+CATEGORICAL_DTYPES = ["object", "string", "category"]
+
+
+def categorical_columns(frame: pd.DataFrame) -> List[str]:
+    return frame.select_dtypes(include=CATEGORICAL_DTYPES).columns.tolist()
+
+
+def fit_feature_encoder(frame: pd.DataFrame, sparse: Optional[bool] = None) -> ColumnTransformer:
+    """Fit the feature encoding once for a dataset.
+
+    Produces the same columns, in the same order, as `pd.get_dummies` on
+    the training frame: other columns pass through first, then one column
+    per category. Unlike `get_dummies` the categories are fixed, so any
+    later batch encodes onto the training columns, with unseen or missing
+    categories as all zeros. `sparse` defaults to whether the one-hot
+    block reaches SPARSE_ONE_HOT_MIN_COLUMNS.
+    """
+    categorical = categorical_columns(frame)
+    passthrough = [column for column in frame.columns if column not in set(categorical)]
+    # pd.Categorical orders categories exactly like get_dummies does.
+    categories = [pd.Categorical(frame[column]).categories.tolist() for column in categorical]
+    if sparse is None:
+        sparse = sum(len(values) for values in categories) >= SPARSE_ONE_HOT_MIN_COLUMNS
+
+    encoder = ColumnTransformer(
+        [
+            ("passthrough", "passthrough", passthrough),
+            (
+                "one_hot",
+                OneHotEncoder(categories=categories, handle_unknown="ignore", sparse_output=sparse, dtype=np.float32),
+                categorical,
+            ),
+        ],
+        sparse_threshold=1.0 if sparse else 0.0,
+        verbose_feature_names_out=False,
+    )
+    return encoder.fit(frame)
+
+
+def encode_features(encoder: ColumnTransformer, frame: pd.DataFrame):
+    X = encoder.transform(frame)
+    if sp.issparse(X):
+        return X.tocsr().astype(np.float32)
+    return np.asarray(X, dtype=np.float32)
+
+
+def encoded_feature_names(encoder: ColumnTransformer) -> List[str]:
+    return [str(name) for name in encoder.get_feature_names_out()]
+
+
+def bundle_model(encoder: ColumnTransformer, model: Any) -> Pipeline:
+    # The exported artifact scores raw frames: pipeline.predict(df).
+    return Pipeline([("preprocess", encoder), ("model", model)])
@@ -0,0 +1,273 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+import numpy as np
+
+from .evaluation import create_evaluator, resolve_worker_count
+from .genetic_algorithm import (
+    FINAL_REFIT_MODELS,
+    HYPERPARAM_RANGES,
+    LIMIT_PENALTY,
+    OptimizationCancelled,
+    _evaluation_limits,
+    evaluate_fitness,
+    train_model,
+)
+from .instrumentation import RunTimings
+from .population import GeneSchema, breed_one, fitness_ranks, population_diversity
+
+logger = logging.getLogger(__name__)
+
+
+def _bucket_detail(number, bucket, genes, evaluations, bucket_started):
+    finite = [record for record in bucket if np.isfinite(record["fitness"])]
+    scores = [record["fitness"] for record in finite]
+    ranked = sorted(finite or bucket, key=lambda record: record["fitness"], reverse=True)
+    return {
+        "generation": number,
+        "best_score": max(scores) if scores else None,
+        "average_score": float(np.mean(scores)) if scores else None,
+        "median_score": float(np.median(scores)) if scores else None,
+        "std_dev": float(np.std(scores)) if len(scores) > 1 else 0.0 if scores else None,
+        "top_candidates": [
+            {
+                "rank": idx + 1,
+                "score": record["fitness"] if np.isfinite(record["fitness"]) else None,
+                "params": dict(record["chromosome"]),
+            }
+            for idx, record in enumerate(ranked[:3])
+        ],
+        "diversity": population_diversity(genes),
+        "evaluations": evaluations,
+        "wall_seconds": time.perf_counter() - bucket_started,
+    }
+
+
+def run_steady_state(
+    X_train,
+    y_train,
+    X_val,
+    y_val,
+    generations=10,
+    population_size=10,
+    model_type="random_forest",
+    return_model=False,
+    evaluation_backend="serial",
+    n_workers=None,
+    progress_callback=None,
+    cancel_event=None,
+    fitness_cache=None,
+    patience=None,
+    min_delta=0.0,
+    min_diversity=None,
+    time_budget_seconds=None,
+    max_evaluations=None,
+    mutation_rate=0.1,
+    initial_genes=None,
+    seed=None,
+    evaluation_timeout_seconds=None,
+    evaluation_memory_limit_mb=None,
+):
+    """Asynchronous steady-state GA.
+
+    There is no generation barrier: each finished evaluation replaces the
+    worst member of the population if it beats it, and a new child is bred
+    and dispatched straight away, so every worker stays busy however
+    uneven the model costs are. Statistics are reported per bucket of
+    population_size evaluations, which play the role of generations.
+    Results depend on completion order, so only the serial backend is
+    reproducible run to run.
+    """
+    started = time.monotonic()
+    timings = RunTimings()
+    schema = GeneSchema(HYPERPARAM_RANGES[model_type])
+    # Same seed derivation as run_ga, so serial steady-state runs share the
+    # models' random_state with generational runs of the same seed.
+    seed_sequence = np.random.SeedSequence(seed)
+    ga_sequence, model_sequence = seed_sequence.spawn(4)[:2]
+    rng = np.random.default_rng(ga_sequence)
+    model_seed = int(model_sequence.generate_state(1)[0])
+
+    budget = generations * population_size
+    if max_evaluations is not None:
+        budget = min(budget, max_evaluations)
+
+    initial = schema.sample(population_size, rng)
+    if initial_genes is not None and len(initial_genes):
+        seeded = np.asarray(initial_genes, dtype=float)[:population_size]
+        initial[:len(seeded)] = seeded
+    # Unevaluated initial individuals are dispatched first; children are only
+    # bred once the population is full.
+    backlog = list(initial)
+    genes = np.empty((0, schema.width))
+    fitnesses = np.empty(0)
+
+    best_fitness = float('-inf')
+    best_model = None
+    best_params = None
+    generation_scores = []
+    generation_details = []
+    bucket = []
+    dispatched = 0
+    evaluations = 0
+    stop_reason = "generations"
+    stale_buckets = 0
+    plateau_score = float('-inf')
+    busy_seconds = 0.0
+    bucket_started = time.perf_counter()
+
+    # Unset n_workers means every core; the pool never needs more workers
+    # than there are population slots.
+    n_workers = min(resolve_worker_count(n_workers), population_size)
+    evaluator = create_evaluator(
+        evaluation_backend,
+        evaluate_fitness,
+        (X_train, X_val, y_train, y_val, model_type, model_seed),
+        n_workers=n_workers,
+        **_evaluation_limits(evaluation_timeout_seconds, evaluation_memory_limit_mb, LIMIT_PENALTY),
+    )
+    limited = evaluation_backend == "isolated"
+    reported_timeouts = 0
+    reported_crashes = 0
+
+    def add_limit_counts(detail):
+        nonlocal reported_timeouts, reported_crashes
+        if limited:
+            detail["timed_out_evaluations"] = evaluator.timeouts - reported_timeouts
+            detail["crashed_evaluations"] = evaluator.crashes - reported_crashes
+            reported_timeouts, reported_crashes = evaluator.timeouts, evaluator.crashes
+
+    # More evaluations in flight than population slots would only queue up
+    # children bred from a stale population.
+    slots = min(evaluator.n_workers, population_size)
+
+    def can_dispatch():
+        # Children need a full population to select parents from.
+        return bool(backlog) or len(fitnesses) >= population_size
+
+    def next_candidate():
+        if backlog:
+            return backlog.pop(0)
+        ranks = fitness_ranks(np.ones(len(fitnesses)), fitnesses)
+        return breed_one(genes, ranks, schema, rng, mutation_rate, timings)
+
+    with evaluator:
+        in_flight = {}
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise OptimizationCancelled("Optimization cancelled during steady-state search.")
+
+            while (
+                stop_reason == "generations"
+                and dispatched < budget
+                and len(in_flight) < slots
+                and can_dispatch()
+            ):
+                candidate = next_candidate()
+                chromosome = schema.decode(candidate)
+                dispatched += 1
+                key = fitness_cache.key(chromosome) if fitness_cache is not None else None
+                cached = fitness_cache.lookup(key) if key is not None else None
+                if cached is None:
+                    in_flight[evaluator.submit(chromosome)] = (candidate, chromosome, key, time.monotonic())
+                else:
+                    # Cache hits go through the same completion path without
+                    # occupying a worker.
+                    future = Future()
+                    future.set_result((cached, chromosome if np.isfinite(cached) else None, None, None))
+                    in_flight[future] = (candidate, chromosome, None, None)
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate, chromosome, key, submitted = in_flight.pop(future)
+                fitness, params, model, evaluation_timings = future.result()
+                timings.add_all(evaluation_timings)
+                if submitted is not None:
+                    busy_seconds += time.monotonic() - submitted
+                    if key is not None:
+                        fitness_cache.store(key, fitness)
+                evaluations += 1
+
+                if len(fitnesses) < population_size:
+                    genes = np.vstack([genes, candidate])
+                    fitnesses = np.append(fitnesses, fitness)
+                else:
+                    worst = int(np.argmin(fitnesses))
+                    if fitness >= fitnesses[worst]:
+                        genes[worst] = candidate
+                        fitnesses[worst] = fitness
+
+                if fitness > best_fitness:
+                    best_fitness = fitness
+                    best_params = params
+                    best_model = model
+
+                bucket.append({"chromosome": chromosome, "fitness": fitness})
+                if len(bucket) < population_size:
+                    continue
+
+                detail = _bucket_detail(len(generation_details) + 1, bucket, genes, evaluations, bucket_started)
+                add_limit_counts(detail)
+                bucket = []
+                bucket_started = time.perf_counter()
+                generation_details.append(detail)
+                bucket_best = detail["best_score"] if detail["best_score"] is not None else float('-inf')
+                generation_scores.append(bucket_best if np.isfinite(bucket_best) else 0.0)
+                logger.info("Bucket %d | Best Fitness: %.4f", detail["generation"], bucket_best)
+                if progress_callback is not None:
+                    progress_callback(detail)
+
+                if bucket_best > plateau_score + min_delta:
+                    plateau_score = bucket_best
+                    stale_buckets = 0
+                else:
+                    stale_buckets += 1
+                if dispatched < budget and stop_reason == "generations":
+                    if patience is not None and stale_buckets >= patience:
+                        stop_reason = "patience"
+                    elif min_diversity is not None and detail["diversity"] <= min_diversity:
+                        stop_reason = "diversity_collapse"
+                    elif time_budget_seconds is not None and time.monotonic() - started >= time_budget_seconds:
+                        stop_reason = "time_budget"
+                    # Evaluations already in flight still finish and count.
+
+    if bucket:
+        detail = _bucket_detail(len(generation_details) + 1, bucket, genes, evaluations, bucket_started)
+        add_limit_counts(detail)
+        generation_details.append(detail)
+        generation_scores.append(detail["best_score"] if detail["best_score"] is not None else 0.0)
+        if progress_callback is not None:
+            progress_callback(detail)
+
+    if stop_reason == "generations" and max_evaluations is not None and budget == max_evaluations < generations * population_size:
+        stop_reason = "max_evaluations"
+
+    # Cached and CV-scored winners have no fitted model, and search fits of
+    # some models are cut down; either way the winner is retrained here.
+    if return_model and best_params is not None and (best_model is None or model_type in FINAL_REFIT_MODELS):
+        with timings.phase("final_fit"):
+            best_model = train_model(best_params, X_train, y_train, model_type, random_state=model_seed)
+
+    elapsed = time.monotonic() - started
+    run_summary = {
+        "seed": seed_sequence.entropy,
+        "stop_reason": stop_reason,
+        "generations_run": len(generation_details),
+        "evaluations": evaluations,
+        "elapsed_seconds": elapsed,
+        # Share of worker time spent training rather than idle.
+        "worker_utilization": busy_seconds / (elapsed * evaluator.n_workers) if elapsed > 0 else 0.0,
+        "timings": timings.as_dict(),
+    }
+    if limited:
+        run_summary["timed_out_evaluations"] = evaluator.timeouts
+        run_summary["crashed_evaluations"] = evaluator.crashes
+
+    if return_model:
+        return best_params, best_fitness, generation_scores, best_model, generation_details, run_summary
+
+    return best_params, best_fitness, generation_scores, generation_details, run_summary
@@ -0,0 +1,237 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+CSV_CHUNK_ROWS = int(os.environ.get("CSV_CHUNK_ROWS", "100000"))
+MEDIAN_RESERVOIR_SIZE = 100_000
+
+
+async def spool_upload(file, directory: Path) -> Tuple[Path, str, int]:
+    # Write the upload to disk piece by piece, hashing as we go, so the raw
+    # bytes are never held in memory as a whole.
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / f"upload-{uuid.uuid4().hex}.tmp"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as handle:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                handle.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, digest.hexdigest(), size
+
+
+def _merge_dtype(current: str, observed: str) -> str:
+    if current == observed:
+        return current
+    if {current, observed} <= {"int64", "float64"}:
+        return "float64"
+    return "object"
+
+
+def resolve_csv_dtypes(path: Path, chunk_rows: int = CSV_CHUNK_ROWS) -> Dict[str, str]:
+    # Mirrors what a single pd.read_csv would infer: ints widen to float when
+    # any chunk has gaps, and any disagreement beyond that falls back to object.
+    dtypes: Dict[str, str] = {}
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        for col, dtype in chunk.dtypes.items():
+            kind = dtype.kind
+            observed = "int64" if kind in "iu" else "float64" if kind == "f" else "bool" if kind == "b" else "object"
+            dtypes[col] = _merge_dtype(dtypes[col], observed) if col in dtypes else observed
+    return dtypes
+
+
+def iter_csv_chunks(path: Path, dtypes: Dict[str, str], chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    return pd.read_csv(path, dtype=dtypes, chunksize=chunk_rows)
+
+
+def _zero_out_fperr(values: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(values) < 1e-14, 0.0, values)
+
+
+def skew_from_moments(count: np.ndarray, m2: np.ndarray, m3: np.ndarray) -> np.ndarray:
+    # Same bias-adjusted estimator as pandas.Series.skew, from central sums.
+    m2 = _zero_out_fperr(m2)
+    m3 = _zero_out_fperr(m3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = (count * (count - 1) ** 0.5 / (count - 2)) * (m3 / m2 ** 1.5)
+    result = np.where(m2 == 0, 0.0, result)
+    return np.where(count < 3, np.nan, result)
+
+
+def kurtosis_from_moments(count: np.ndarray, m2: np.ndarray, m4: np.ndarray) -> np.ndarray:
+    # Same bias-adjusted excess kurtosis as pandas.Series.kurt.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adj = 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+        numerator = _zero_out_fperr(count * (count + 1) * (count - 1) * m4)
+        denominator = _zero_out_fperr((count - 2) * (count - 3) * m2 ** 2)
+        result = numerator / denominator - adj
+    result = np.where(denominator == 0, 0.0, result)
+    return np.where(count < 4, np.nan, result)
+
+
+def pearson_from_sums(n, sum_x, sum_y, sum_xx, sum_yy, sum_xy) -> np.ndarray:
+    # Pairwise-complete Pearson r: every sum only covers rows where both
+    # columns of the pair are present.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x ** 2 / n
+        var_y = sum_yy - sum_y ** 2 / n
+        corr = cov / np.sqrt(var_x * var_y)
+    return np.where((n < 2) | (var_x <= 0) | (var_y <= 0), np.nan, np.clip(corr, -1.0, 1.0))
+
+
+class NumericAccumulator:
+    """One-pass count/mean/central moments/min/max per column.
+
+    Chunks are folded in with the pairwise update of Pébay (2008), and a
+    fixed-size reservoir sample stands in for the median once a column has
+    more values than the reservoir holds.
+    """
+
+    def __init__(self, columns: List[str], reservoir_size: int = MEDIAN_RESERVOIR_SIZE, seed: int = 0):
+        width = len(columns)
+        self.columns = columns
+        self.count = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.m3 = np.zeros(width)
+        self.m4 = np.zeros(width)
+        self.minimum = np.full(width, np.inf)
+        self.maximum = np.full(width, -np.inf)
+        self.reservoir_size = reservoir_size
+        self._reservoirs: List[np.ndarray] = [np.empty(0) for _ in columns]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        present = ~np.isnan(values)
+        count_b = present.sum(axis=0).astype(float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_b = np.where(count_b > 0, np.nansum(values, axis=0) / count_b, 0.0)
+        centered = np.where(present, values - mean_b, 0.0)
+        m2_b = (centered ** 2).sum(axis=0)
+        m3_b = (centered ** 3).sum(axis=0)
+        m4_b = (centered ** 4).sum(axis=0)
+
+        count_a = self.count
+        total = count_a + count_b
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = mean_b - self.mean
+            ratio = np.where(total > 0, count_a * count_b / total, 0.0)
+            weight_b = np.where(total > 0, count_b / total, 0.0)
+            safe_total = np.where(total > 0, total, 1.0)
+            self.m4 = (
+                self.m4 + m4_b
+                + delta ** 4 * ratio * (count_a ** 2 - count_a * count_b + count_b ** 2) / safe_total ** 2
+                + 6 * delta ** 2 * (count_a ** 2 * m2_b + count_b ** 2 * self.m2) / safe_total ** 2
+                + 4 * delta * (count_a * m3_b - count_b * self.m3) / safe_total
+            )
+            self.m3 = (
+                self.m3 + m3_b
+                + delta ** 3 * ratio * (count_a - count_b) / safe_total
+                + 3 * delta * (count_a * m2_b - count_b * self.m2) / safe_total
+            )
+            self.m2 = self.m2 + m2_b + delta ** 2 * ratio
+            self.mean = self.mean + delta * weight_b
+        self.count = total
+
+        with np.errstate(invalid="ignore"):
+            self.minimum = np.fmin(self.minimum, np.nanmin(np.where(present, values, np.inf), axis=0))
+            self.maximum = np.fmax(self.maximum, np.nanmax(np.where(present, values, -np.inf), axis=0))
+
+        for idx in range(values.shape[1]):
+            self._sample(idx, values[present[:, idx], idx], int(count_a[idx]))
+
+    def _sample(self, idx: int, column_values: np.ndarray, seen: int) -> None:
+        reservoir = self._reservoirs[idx]
+        room = self.reservoir_size - reservoir.size
+        if room > 0:
+            taken = column_values[:room]
+            reservoir = np.concatenate([reservoir, taken])
+            column_values = column_values[room:]
+            seen += taken.size
+        if column_values.size:
+            positions = seen + np.arange(1, column_values.size + 1)
+            keep = self._rng.random(column_values.size) < self.reservoir_size / positions
+            slots = self._rng.integers(0, self.reservoir_size, size=int(keep.sum()))
+            reservoir[slots] = column_values[keep]
+        self._reservoirs[idx] = reservoir
+
+    def median(self, idx: int) -> float:
+        # Exact while every value fits in the reservoir, an estimate beyond.
+        return float(np.median(self._reservoirs[idx]))
+
+    def std(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self.m2 / (self.count - 1))
+
+    def skew(self) -> np.ndarray:
+        return skew_from_moments(self.count, self.m2, self.m3)
+
+    def kurtosis(self) -> np.ndarray:
+        return kurtosis_from_moments(self.count, self.m2, self.m4)
+
+
+class CorrelationAccumulator:
+    """Pairwise-complete Pearson correlation from streamed sums.
+
+    Memory is O(columns^2) and independent of the row count. Values are
+    shifted by the first chunk's means to limit cancellation.
+    """
+
+    def __init__(self, columns: List[str]):
+        width = len(columns)
+        self.columns = columns
+        self.shift = None
+        self.pair_count = np.zeros((width, width))
+        self.sum_x = np.zeros((width, width))
+        self.sum_xx = np.zeros((width, width))
+        self.sum_xy = np.zeros((width, width))
+
+    def update(self, values: np.ndarray) -> None:
+        if self.shift is None:
+            present = ~np.isnan(values)
+            counts = present.sum(axis=0)
+            self.shift = np.where(present, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        present = (~np.isnan(values)).astype(float)
+        shifted = np.where(present > 0, values - self.shift, 0.0)
+        self.pair_count += present.T @ present
+        self.sum_x += shifted.T @ present
+        self.sum_xx += (shifted ** 2).T @ present
+        self.sum_xy += shifted.T @ shifted
+
+    def matrix(self) -> np.ndarray:
+        return pearson_from_sums(
+            self.pair_count, self.sum_x, self.sum_x.T, self.sum_xx, self.sum_xx.T, self.sum_xy
+        )
+
+
+class CategoricalAccumulator:
+    def __init__(self, columns: List[str]):
+        self.columns = columns
+        # Plain dicts keep values in first-seen order across chunks, which is
+        # the order value_counts() breaks ties in.
+        self.counts: Dict[str, Dict[str, int]] = {col: {} for col in columns}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        for col in self.columns:
+            counts = self.counts[col]
+            for value, count in chunk[col].astype(str).value_counts(sort=False).items():
+                counts[value] = counts.get(value, 0) + int(count)
+
+    def value_counts(self, col: str) -> pd.Series:
+        # Sorted the way Series.value_counts() sorts its first-seen counts.
+        return pd.Series(self.counts[col], dtype="int64").sort_values(ascending=False)
@@ -0,0 +1,74 @@
+from typing import Optional
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from .population import GeneSchema
+
+SURROGATE_TREES = 50
+
+
+class FitnessSurrogate:
+    """Random forest fitted on every fully scored chromosome of the run.
+
+    Offspring are ranked by an upper confidence bound, the forest's mean
+    prediction plus `exploration` times the spread across its trees, so the
+    screen keeps both candidates that look good and candidates the history
+    says little about.
+    """
+
+    def __init__(
+        self,
+        schema: GeneSchema,
+        exploration: float = 1.0,
+        min_history: Optional[int] = None,
+        random_state: Optional[int] = None,
+    ):
+        self.schema = schema
+        self.exploration = exploration
+        self.min_history = min_history if min_history is not None else max(8, 2 * schema.width)
+        self.random_state = random_state
+        self.history_genes = np.empty((0, schema.width))
+        self.history_scores = np.empty(0)
+        self._forest: Optional[RandomForestRegressor] = None
+
+    @property
+    def ready(self) -> bool:
+        return len(self.history_scores) >= self.min_history
+
+    def observe(self, genes: np.ndarray, scores) -> None:
+        scores = np.asarray(scores, dtype=float)
+        finite = np.isfinite(scores)
+        if not finite.any():
+            return
+        self.history_genes = np.vstack([self.history_genes, genes[finite]])
+        self.history_scores = np.concatenate([self.history_scores, scores[finite]])
+        self._forest = None
+
+    def _normalize(self, genes: np.ndarray) -> np.ndarray:
+        return (genes - self.schema.lower) / (self.schema.upper - self.schema.lower)
+
+    def _fit(self) -> RandomForestRegressor:
+        if self._forest is None:
+            self._forest = RandomForestRegressor(
+                n_estimators=SURROGATE_TREES,
+                min_samples_leaf=2,
+                random_state=self.random_state,
+            ).fit(self._normalize(self.history_genes), self.history_scores)
+        return self._forest
+
+    def screen(self, pool: np.ndarray, count: int) -> np.ndarray:
+        forest = self._fit()
+        X = self._normalize(pool)
+        per_tree = np.stack([tree.predict(X) for tree in forest.estimators_])
+        bound = per_tree.mean(axis=0) + self.exploration * per_tree.std(axis=0)
+
+        # Prefer distinct chromosomes, and ones not trained before; repeats
+        # only fill the remaining slots when the pool runs short.
+        _, first = np.unique(pool, axis=0, return_index=True)
+        distinct = np.zeros(len(pool), dtype=bool)
+        distinct[first] = True
+        seen = {row.tobytes() for row in self.history_genes}
+        novel = np.array([row.tobytes() not in seen for row in pool])
+        order = np.lexsort((-bound, ~(distinct & novel)))
+        return pool[order[:count]]
@@ -0,0 +1,62 @@
+"""Run the benchmark suites, write one JSON report and compare to a baseline.
+
+Run from the backend directory:
+
+    python -m benchmarks --json baseline.json
+    python -m benchmarks --json current.json --baseline baseline.json --tolerance 0.15
+    python -m benchmarks --quick --suites ga upload
+
+With --baseline the exit status is 1 when any evaluations/sec, rows/sec,
+requests/sec, best time, p95 latency or peak memory figure is worse than the
+baseline by more than the tolerance. Baselines are only comparable on the
+same machine.
+"""
+import argparse
+import logging
+import sys
+
+from . import bench_api, bench_ga, bench_upload
+from .harness import compare, load_report, print_comparison, report, write_report
+
+SUITES = ("ga", "upload", "api")
+
+
+def run_suite(name, quick):
+    print(f"== {name}")
+    if name == "ga":
+        sizes = bench_ga.QUICK_SIZES if quick else bench_ga.DEFAULT_SIZES
+        return bench_ga.run(sizes, generations=2 if quick else 3, population_size=4 if quick else 6, repeat=1)
+    if name == "upload":
+        rows = bench_upload.QUICK_ROWS if quick else bench_upload.DEFAULT_ROWS
+        return bench_upload.run(rows, columns=20, repeat=3)
+    return bench_api.run([1, 2] if quick else bench_api.DEFAULT_CONCURRENCY, total=4 if quick else 8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes, for a smoke run.")
+    parser.add_argument("--json", help="Write the report to this file.")
+    parser.add_argument("--baseline", help="Report from an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed slowdown as a fraction (default 0.1).")
+    args = parser.parse_args()
+
+    # Per-generation and per-request log lines would drown the results.
+    logging.getLogger().setLevel(logging.WARNING)
+    data = report({name: run_suite(name, args.quick) for name in args.suites})
+    data["quick"] = args.quick
+
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        if baseline.get("quick") != args.quick:
+            print("Warning: baseline and current run use different --quick settings; only matching cases compare.")
+        data["comparison"] = compare(data, baseline, args.tolerance)
+        print_comparison(data["comparison"])
+    if args.json:
+        write_report(args.json, data)
+    if args.baseline and data["comparison"]["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Throughput of /optimize/start-optimization under concurrent clients.
+
+Requests go through httpx's ASGI transport straight into the app, so the
+numbers include routing, validation, the job queue and the search itself
+but no network. Storage goes to a temporary directory.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --concurrency 1 4 8 --requests 16 --json api.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+import httpx
+import pandas as pd
+from sklearn.datasets import make_classification
+
+from app.main import app
+from app.services.artifacts import artifact_writer
+
+from .harness import scratch_storage
+
+DEFAULT_CONCURRENCY = [1, 2, 4]
+
+
+def _dataset_csv(rows, features):
+    X, y = make_classification(n_samples=rows, n_features=features, random_state=0)
+    df = pd.DataFrame(X, columns=[f"x{idx}" for idx in range(features)])
+    df["target"] = y
+    return df.to_csv(index=False).encode("utf-8")
+
+
+async def _load(client, payload, concurrency, total):
+    latencies = []
+    failures = 0
+    pending = iter(range(total))
+
+    async def worker():
+        nonlocal failures
+        for _ in pending:
+            start = time.perf_counter()
+            response = await client.post("/optimize/start-optimization", json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200 or "error" in response.json():
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, failures
+
+
+async def _run(concurrency_levels, total, rows, features, generations, population_size):
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        upload = await client.post(
+            "/load/upload-dataset", files={"file": ("bench.csv", _dataset_csv(rows, features), "text/csv")}
+        )
+        payload = {
+            "dataset_id": upload.json()["dataset_id"],
+            "target_column": "target",
+            "generations": generations,
+            "population_size": population_size,
+            # Every request must do the same work, so no cross-request cache hits.
+            "use_fitness_cache": False,
+        }
+        # One warm-up request loads and prepares the dataset.
+        await client.post("/optimize/start-optimization", json=payload)
+
+        for concurrency in concurrency_levels:
+            elapsed, latencies, failures = await _load(client, payload, concurrency, total)
+            ordered = sorted(latencies)
+            case = {
+                "name": f"start_optimization/c{concurrency}/{rows}x{features}",
+                "concurrency": concurrency,
+                "requests": total,
+                "failures": failures,
+                "elapsed_seconds": round(elapsed, 4),
+                "requests_per_second": round(total / elapsed, 3),
+                "p50_latency_seconds": round(statistics.median(ordered), 4),
+                "p95_latency_seconds": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 4),
+            }
+            results.append(case)
+            print(
+                f"{case['name']:<40} {case['requests_per_second']:8.2f} req/s  "
+                f"p50 {case['p50_latency_seconds']:7.3f}s  p95 {case['p95_latency_seconds']:7.3f}s  "
+                f"failures {failures}"
+            )
+    return results
+
+
+def run(concurrency_levels, total, rows=500, features=10, generations=2, population_size=4):
+    with scratch_storage():
+        try:
+            return asyncio.run(_run(concurrency_levels, total, rows, features, generations, population_size))
+        finally:
+            # Model artifacts are written in the background; let them land
+            # before the scratch directory goes away.
+            artifact_writer.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--generations", type=int, default=2)
+    parser.add_argument("--population-size", type=int, default=4)
+    parser.add_argument("--json", help="Write results to this file as JSON.")
+    args = parser.parse_args()
+
+    # Per-generation and per-request log lines would drown the results.
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(args.concurrency, args.requests, args.rows, args.features, args.generations, args.population_size)
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"benchmark": "api_start_optimization", "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Time run_ga for each model type on synthetic data of growing size.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_ga
+    python -m benchmarks.bench_ga --sizes 500x10 5000x50 --generations 3 --json ga.json
+"""
+import argparse
+import json
+import logging
+
+from sklearn.datasets import make_classification, make_regression
+from sklearn.model_selection import train_test_split
+
+from app.services.genetic_algorithm import HYPERPARAM_RANGES, run_ga
+
+from .harness import measure
+
+DEFAULT_SIZES = ["500x10", "2000x20", "10000x50"]
+QUICK_SIZES = ["300x8", "1000x16"]
+# SVC in this project is classification only.
+TASKS = {
+    "classification": list(HYPERPARAM_RANGES),
+    "regression": [model_type for model_type in HYPERPARAM_RANGES if model_type != "svm"],
+}
+
+
+def parse_size(size):
+    rows, features = size.lower().split("x")
+    return int(rows), int(features)
+
+
+def make_data(task, rows, features, seed=0):
+    if task == "classification":
+        X, y = make_classification(
+            n_samples=rows, n_features=features, n_informative=max(2, features // 2), random_state=seed
+        )
+    else:
+        X, y = make_regression(n_samples=rows, n_features=features, noise=10.0, random_state=seed)
+    return train_test_split(X, y, test_size=0.2, random_state=seed)
+
+
+def run(sizes, generations, population_size, repeat, backend="serial", n_workers=None):
+    results = []
+    for size in sizes:
+        rows, features = parse_size(size)
+        for task, model_types in TASKS.items():
+            X_train, X_val, y_train, y_val = make_data(task, rows, features)
+            for model_type in model_types:
+                summary = {}
+
+                def search():
+                    result = run_ga(
+                        X_train,
+                        y_train,
+                        X_val,
+                        y_val,
+                        generations=generations,
+                        population_size=population_size,
+                        model_type=model_type,
+                        evaluation_backend=backend,
+                        n_workers=n_workers,
+                        seed=0,
+                    )
+                    summary.update(result[-1])
+                    return result
+
+                _, stats = measure(search, repeat)
+                case = {
+                    "name": f"{task}/{model_type}/{rows}x{features}",
+                    "task": task,
+                    "model_type": model_type,
+                    "rows": rows,
+                    "features": features,
+                    "evaluations": summary["evaluations"],
+                    **stats,
+                    "evaluations_per_second": round(summary["evaluations"] / stats["best_seconds"], 3),
+                }
+                results.append(case)
+                print(
+                    f"{case['name']:<40} best {stats['best_seconds']:8.3f}s  "
+                    f"{case['evaluations_per_second']:8.2f} eval/s  peak {stats['peak_memory_mb']:8.1f} MB"
+                )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="ROWSxFEATURES, e.g. 2000x20")
+    parser.add_argument("--generations", type=int, default=3)
+    parser.add_argument("--population-size", type=int, default=6)
+    parser.add_argument("--backend", default="serial")
+    parser.add_argument("--n-workers", type=int)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", help="Write results to this file as JSON.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = run(args.sizes, args.generations, args.population_size, args.repeat, args.backend, args.n_workers)
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"benchmark": "run_ga", "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Time the dataset summary on synthetic tables of increasing width.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_summary
+    python -m benchmarks.bench_summary --rows 5000 --widths 10 100 1000 --json summary.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.dataset_handler import _summarize_dataframe
+
+DEFAULT_WIDTHS = [10, 100, 1000, 10000]
+
+
+def make_frame(rows: int, width: int, seed: int = 0) -> pd.DataFrame:
+    # Mostly float features built from a few latent factors (so correlations
+    # are non-trivial), a slice of integer and categorical columns, and ~2%
+    # missing values in a quarter of the float columns.
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(size=(rows, 8))
+    float_width = max(1, int(width * 0.8))
+    loadings = rng.normal(size=(8, float_width))
+    floats = factors @ loadings + rng.normal(scale=2.0, size=(rows, float_width))
+    gaps = rng.random((rows, float_width)) < 0.02
+    gaps[:, float_width // 4:] = False
+    floats[gaps] = np.nan
+
+    frame = {f"f{idx}": floats[:, idx] for idx in range(float_width)}
+    int_width = max(0, int(width * 0.1))
+    for idx in range(int_width):
+        frame[f"i{idx}"] = rng.integers(0, 100, size=rows)
+    for idx in range(width - float_width - int_width):
+        frame[f"c{idx}"] = rng.choice(["red", "green", "blue", "amber"], size=rows)
+    return pd.DataFrame(frame)
+
+
+def run(rows: int, widths, repeat: int):
+    results = []
+    for width in widths:
+        df = make_frame(rows, width)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _summarize_dataframe(df)
+            timings.append(time.perf_counter() - start)
+        results.append(
+            {
+                "rows": rows,
+                "columns": width,
+                "best_seconds": round(min(timings), 4),
+                "mean_seconds": round(sum(timings) / len(timings), 4),
+            }
+        )
+        print(f"{rows:>8} rows x {width:>6} cols  best {min(timings):8.3f}s  mean {sum(timings) / len(timings):8.3f}s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--widths", type=int, nargs="+", default=DEFAULT_WIDTHS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this file as JSON.")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.widths, args.repeat)
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"benchmark": "dataset_summary", "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
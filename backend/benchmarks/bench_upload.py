@@ -0,0 +1,72 @@
+"""Time the dataset summary and the full upload path on growing row counts.
+
+handle_upload is driven with an in-memory UploadFile, so the numbers cover
+spooling to disk, hashing, parsing and summarising but not HTTP. Uploads
+land in a temporary directory.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_upload
+    python -m benchmarks.bench_upload --rows 1000 100000 --columns 40 --json upload.json
+"""
+import argparse
+import asyncio
+import io
+import json
+
+from starlette.datastructures import UploadFile
+
+from app.services.dataset_handler import _summarize_dataframe, handle_upload
+
+from .bench_summary import make_frame
+from .harness import measure, scratch_storage
+
+DEFAULT_ROWS = [1000, 10000, 100000]
+QUICK_ROWS = [1000, 10000]
+
+
+def run(rows_list, columns, repeat):
+    results = []
+    with scratch_storage():
+        for rows in rows_list:
+            df = make_frame(rows, columns)
+            content = df.to_csv(index=False).encode("utf-8")
+
+            def upload():
+                file = UploadFile(file=io.BytesIO(content), filename="bench.csv")
+                return asyncio.run(handle_upload(file))
+
+            for name, fn in (("summarize_dataframe", lambda: _summarize_dataframe(df)), ("handle_upload", upload)):
+                _, stats = measure(fn, repeat)
+                case = {
+                    "name": f"{name}/{rows}x{columns}",
+                    "rows": rows,
+                    "columns": columns,
+                    "csv_bytes": len(content),
+                    **stats,
+                    "rows_per_second": round(rows / stats["best_seconds"], 1),
+                }
+                results.append(case)
+                print(
+                    f"{case['name']:<36} best {stats['best_seconds']:8.3f}s  "
+                    f"{case['rows_per_second']:>12.0f} rows/s  peak {stats['peak_memory_mb']:8.1f} MB"
+                )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this file as JSON.")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.columns, args.repeat)
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"benchmark": "dataset_upload", "results": results}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Shared measurement, reporting and baseline comparison for the benchmarks."""
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Metrics compared against a baseline, and which direction is better.
+HIGHER_IS_BETTER = {"evaluations_per_second", "requests_per_second", "rows_per_second"}
+LOWER_IS_BETTER = {"best_seconds", "peak_memory_mb", "p95_latency_seconds"}
+
+
+def measure(fn, repeat=3):
+    """Time `fn` `repeat` times, then run it once more under tracemalloc.
+
+    Tracing slows allocation-heavy code down, so the peak-memory run is kept
+    out of the timings. tracemalloc sees Python and NumPy allocations, which
+    is where a regression in this code base would show up.
+    """
+    timings = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return value, {
+        "best_seconds": round(min(timings), 4),
+        "mean_seconds": round(statistics.mean(timings), 4),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+@contextmanager
+def scratch_storage():
+    # The services write under a relative app/storage, so running from a
+    # temporary directory keeps benchmark uploads, models and checkpoints out
+    # of the working tree.
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="hpo-bench-") as directory:
+        os.makedirs(os.path.join(directory, "app", "storage"))
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+
+def report(suites):
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "suites": suites,
+    }
+
+
+def write_report(path, data):
+    with open(path, "w") as handle:
+        json.dump(data, handle, indent=2)
+
+
+def load_report(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def compare(current, baseline, tolerance):
+    """Cases are matched by suite and name. `change` is positive when a metric
+    got better; it regresses when it is worse than the baseline by more than
+    `tolerance` (a fraction)."""
+    regressions = []
+    improvements = []
+    for suite, cases in current["suites"].items():
+        baseline_cases = {case["name"]: case for case in baseline.get("suites", {}).get(suite, [])}
+        for case in cases:
+            reference = baseline_cases.get(case["name"])
+            if reference is None:
+                continue
+            for metric, value in case.items():
+                old = reference.get(metric)
+                if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or old <= 0:
+                    continue
+                if metric in HIGHER_IS_BETTER:
+                    change = (value - old) / old
+                elif metric in LOWER_IS_BETTER:
+                    change = (old - value) / old
+                else:
+                    continue
+                entry = {
+                    "suite": suite,
+                    "case": case["name"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": value,
+                    "change": round(change, 4),
+                }
+                if change < -tolerance:
+                    regressions.append(entry)
+                elif change > tolerance:
+                    improvements.append(entry)
+    return {"tolerance": tolerance, "regressions": regressions, "improvements": improvements}
+
+
+def print_comparison(comparison):
+    for label, entries in (("REGRESSION", comparison["regressions"]), ("improved", comparison["improvements"])):
+        for entry in entries:
+            print(
+                f"{label:>10}  {entry['suite']}/{entry['case']}  {entry['metric']}: "
+                f"{entry['baseline']} -> {entry['current']} ({entry['change']:+.1%})"
+            )
+    if not comparison["regressions"]:
+        print(f"No regressions beyond {comparison['tolerance']:.0%}.")
@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.model_selection import train_test_split
+
+from app.services import checkpoints
+from app.services.checkpoints import CheckpointWriter, load_best_model, load_checkpoint
+from app.services.genetic_algorithm import OptimizationCancelled, run_ga
+
+CHECKPOINT_ID = "0" * 32
+
+
+@pytest.fixture
+def split():
+    X, y = load_iris(return_X_y=True)
+    return train_test_split(X, y, test_size=0.3, random_state=0, stratify=y)
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_DIR", tmp_path)
+
+
+def _run(split, **options):
+    X_train, X_val, y_train, y_val = split
+    return run_ga(X_train, y_train, X_val, y_val, model_type="svm", seed=7, **options)
+
+
+def _comparable(run):
+    best_params, best_fitness, generation_scores, generation_details, _ = run
+    details = [{key: value for key, value in detail.items() if key != "wall_seconds"} for detail in generation_details]
+    return best_params, best_fitness, generation_scores, details
+
+
+def _interrupted_then_resumed(split, stop_after, **options):
+    writer = CheckpointWriter(CHECKPOINT_ID, {}, "fingerprint", "dataset")
+    cancel_event = threading.Event()
+
+    def checkpoint(state):
+        writer(state)
+        if state["generation"] == stop_after:
+            cancel_event.set()
+
+    with pytest.raises(OptimizationCancelled):
+        _run(split, checkpoint_callback=checkpoint, cancel_event=cancel_event, **options)
+
+    checkpoint_state = load_checkpoint(CHECKPOINT_ID)
+    assert checkpoint_state["generation"] == stop_after
+    resume_state = {**checkpoint_state, "best_model": load_best_model(checkpoint_state)}
+    return _run(split, resume_state=resume_state, checkpoint_callback=writer, **options)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(),
+        dict(cv_folds=3),
+        dict(surrogate=True),
+    ],
+)
+def test_resumed_run_matches_uninterrupted_run(split, options):
+    options = dict(generations=5, population_size=8, **options)
+    uninterrupted = _run(split, **options)
+    resumed = _interrupted_then_resumed(split, stop_after=2, **options)
+
+    assert _comparable(resumed) == _comparable(uninterrupted)
+
+
+def test_resumed_multi_fidelity_run_matches_uninterrupted_run(split):
+    options = dict(generations=5, population_size=12, elitism=2, multi_fidelity=True, fidelity_min_budget=0.25)
+    uninterrupted = _run(split, **options)
+    resumed = _interrupted_then_resumed(split, stop_after=2, **options)
+
+    assert _comparable(resumed) == _comparable(uninterrupted)
+    assert np.all(np.diff(uninterrupted[2]) >= 0)
@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import dataset_handler, streaming_ingest
+
+CHUNK_ROWS = 7
+
+
+def _frame(seed):
+    rng = np.random.default_rng(seed)
+    rows = 120
+    base = rng.normal(size=rows)
+    frame = pd.DataFrame(
+        {
+            "measure": rng.normal(10, 3, rows),
+            "count": rng.integers(-5, 5, rows),
+            "correlated": base * 2 + rng.normal(size=rows) * 0.3,
+            "base": base,
+            "constant": np.full(rows, 3.0),
+            # Few values over many rows, so top_values has ties to break.
+            "grade": rng.choice(list("abcdefg"), rows),
+            "city": rng.choice(["north", "south", "east", "west"], rows),
+        }
+    )
+    frame.loc[rng.random(rows) < 0.2, "measure"] = np.nan
+    frame.loc[rng.random(rows) < 0.1, "city"] = np.nan
+    return frame
+
+
+def _normalized(summary):
+    # NaN never equals itself; compare the JSON the API would send.
+    return json.loads(json.dumps(summary, default=str).replace("NaN", "null"))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_streaming_summary_matches_in_memory_summary(seed, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        dataset_handler,
+        "resolve_csv_dtypes",
+        lambda path: streaming_ingest.resolve_csv_dtypes(path, chunk_rows=CHUNK_ROWS),
+    )
+    monkeypatch.setattr(
+        dataset_handler,
+        "iter_csv_chunks",
+        lambda path, dtypes: streaming_ingest.iter_csv_chunks(path, dtypes, chunk_rows=CHUNK_ROWS),
+    )
+    path = tmp_path / "dataset.csv"
+    _frame(seed).to_csv(path, index=False)
+
+    columns, streamed = dataset_handler._summarize_csv_stream(path)
+    in_memory = pd.read_csv(path)
+
+    assert columns == in_memory.columns.tolist()
+    assert _normalized(streamed) == _normalized(dataset_handler._summarize_dataframe(in_memory))
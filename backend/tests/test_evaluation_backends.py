@@ -0,0 +1,35 @@
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.model_selection import train_test_split
+
+from app.services.genetic_algorithm import run_ga
+
+
+@pytest.fixture(scope="module")
+def split():
+    X, y = load_iris(return_X_y=True)
+    return train_test_split(X, y, test_size=0.3, random_state=0, stratify=y)
+
+
+def _run(split, backend, **options):
+    X_train, X_val, y_train, y_val = split
+    best_params, best_fitness, generation_scores, generation_details, _ = run_ga(
+        X_train,
+        y_train,
+        X_val,
+        y_val,
+        generations=3,
+        population_size=6,
+        model_type="random_forest",
+        evaluation_backend=backend,
+        n_workers=2,
+        seed=11,
+        **options,
+    )
+    details = [{key: value for key, value in detail.items() if key != "wall_seconds"} for detail in generation_details]
+    return best_params, best_fitness, generation_scores, details
+
+
+@pytest.mark.parametrize("options", [dict(), dict(cv_folds=3), dict(multi_fidelity=True)])
+def test_process_backend_matches_serial(split, options):
+    assert _run(split, "process", **options) == _run(split, "serial", **options)
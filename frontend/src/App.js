@@ -47,6 +47,7 @@ const App = () => {
     setErrorMessage("");
 
     startOptimization({
+      dataset_id: datasetDetails?.dataset_id,
       target_column: selectedTargetColumn,
       generations: Number(gaConfig.generations),
       population_size: Number(gaConfig.populationSize),